@@ -39,37 +39,52 @@ def bridges_and_articulation_points(n: int, edges: list[Edge]):
     bridges: list[Edge] = []
     artic_pts: list[int]= []
 
-    def dfs(i: int, parent_edge: Edge | None):
-        visit(i)
-
-        is_root = parent_edge is None
-
-        low[i] = vis[i]
-
-        found_isolated_child = False
-        children = 0
-
-        for j, *_, edge in adj[i]:
-            if vis[j] == -1:
-                dfs(j, edge)
-                low[i] = min(low[i], low[j])
-                children += 1
-
-                if low[j] > vis[i]:
-                    # bridge
-                    bridges.append(edge)
-                
-                if low[j] >= vis[i]:
-                    found_isolated_child = True
-
-            elif edge is not parent_edge:
-                low[i] = min(low[i], vis[j])
-
-        if (not is_root and found_isolated_child) or (is_root and children >= 2):
-            artic_pts.append(i)
+    children = [0] * n
+    found_isolated_child = [False] * n
+
+    def dfs(s: int):
+        # iterative: todo holds (node, edge we came in by, iterator over its remaining neighbors),
+        # which is what each recursive call would have kept, so long paths don't hit the recursion limit
+        visit(s)
+        low[s] = vis[s]
+        todo = [(s, None, iter(adj[s]))]
+
+        while todo:
+            i, parent_edge, it = todo[-1]
+
+            for j, *_, edge in it:
+                if vis[j] == -1:
+                    # tree edge: go down to j, come back to i later
+                    visit(j)
+                    low[j] = vis[j]
+                    todo.append((j, edge, iter(adj[j])))
+                    break
+
+                elif edge is not parent_edge:
+                    low[i] = min(low[i], vis[j])
+
+            else:
+                # i is done
+                todo.pop()
+                is_root = parent_edge is None
+
+                if not is_root:
+                    p = todo[-1][0]
+                    low[p] = min(low[p], low[i])
+                    children[p] += 1
+
+                    if low[i] > vis[p]:
+                        # bridge
+                        bridges.append(parent_edge)
+
+                    if low[i] >= vis[p]:
+                        found_isolated_child[p] = True
+
+                if (not is_root and found_isolated_child[i]) or (is_root and children[i] >= 2):
+                    artic_pts.append(i)
 
     if n > 0:
-        dfs(0, None)
+        dfs(0)
 
     return bridges, artic_pts
 
@@ -5,15 +5,22 @@ def search(n: int, adj_list: list[list[int]]) -> list[list[int]]:
 
     comps: list[list[int]] = []
 
-    def dfs(i: int):
-        assert not vis[i]
-        vis[i] = True
-
-        comps[-1].append(i)
-
-        for j in adj_list[i]:
-            if not vis[j]:
-                dfs(j)
+    def dfs(s: int):
+        # iterative: todo holds (node, iterator over its remaining neighbors)
+        assert not vis[s]
+        vis[s] = True
+        comps[-1].append(s)
+        todo = [iter(adj_list[s])]
+
+        while todo:
+            for j in todo[-1]:
+                if not vis[j]:
+                    vis[j] = True
+                    comps[-1].append(j)
+                    todo.append(iter(adj_list[j]))
+                    break
+            else:
+                todo.pop()
 
     
     for s in range(n):
@@ -21,17 +21,25 @@ def sccs(n: int, edges: list[Edge]):
 
     vis: list[bool] = [False] * (n + 1)
 
-    def dfs(i: int, adj: dict[int, list[tuple[int, Edge]]], stack: list[int]):
-        # before visiting i
-        assert not vis[i]
-        vis[i] = True
-        
-        for j, *_ in adj[i]:
-            if not vis[j]:
-                dfs(j, adj, stack)
-
-        # after i's expansion
-        stack.append(i)
+    def dfs(s: int, adj: dict[int, list[tuple[int, Edge]]], stack: list[int]):
+        # iterative: todo holds (node, iterator over its remaining neighbors),
+        # so a kingdom of 10^5 planets in a line doesn't hit the recursion limit
+        # before visiting s
+        assert not vis[s]
+        vis[s] = True
+        todo = [(s, iter(adj[s]))]
+
+        while todo:
+            i, it = todo[-1]
+            for j, *_ in it:
+                if not vis[j]:
+                    vis[j] = True
+                    todo.append((j, iter(adj[j])))
+                    break
+            else:
+                # after i's expansion
+                todo.pop()
+                stack.append(i)
 
     stack: list[int] = []
     for x in range(1, n + 1):
@@ -26,18 +26,27 @@ def sccs(n: int, edges: list[Edge]):
 
     vis: list[bool] = [False] * n
     
-    def dfs(i: int, adj: list[list[tuple[int, int | None, Edge]]], stack: list[int]):
+    def dfs(s: int, adj: list[list[tuple[int, int | None, Edge]]], stack: list[int]):
+        # iterative: todo holds (node, iterator over its remaining neighbors),
+        # which is what each recursive call would have kept, so long paths don't hit the recursion limit
         # before
-        assert not vis[i]
-        vis[i] = True
-
-        # loop
-        for j, *_ in adj[i]:
-            if not vis[j]:
-                dfs(j, adj, stack)
-
-        # after expansion
-        stack.append(i)
+        assert not vis[s]
+        vis[s] = True
+        todo = [(s, iter(adj[s]))]
+
+        while todo:
+            i, it = todo[-1]
+
+            # loop
+            for j, *_ in it:
+                if not vis[j]:
+                    vis[j] = True
+                    todo.append((j, iter(adj[j])))
+                    break
+            else:
+                # after expansion
+                todo.pop()
+                stack.append(i)
 
 
     stack: list[int] = []
@@ -1,5 +1,6 @@
 from utils import Edge
 from typing import Sequence, TypeVar, Generic, Iterable
+from operator import attrgetter
 
 T = TypeVar("T")
 
@@ -42,7 +43,7 @@ class UnionFind(Generic[T]):
 
 def kruskal_mst_edges(nodes: Sequence[T], edges: Sequence[Edge[T]]) -> Iterable[Edge[T]]:
     # Sort by weight
-    sorted_edges: Sequence[Edge[T]] = sorted(edges, key=lambda x: x.weight)
+    sorted_edges: Sequence[Edge[T]] = sorted(edges, key=attrgetter("weight"))
 
     components = UnionFind(nodes)
 
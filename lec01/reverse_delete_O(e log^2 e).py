@@ -0,0 +1,146 @@
+from utils import Edge
+from typing import Sequence, TypeVar, Generic
+
+T = TypeVar("T")
+
+class RollBackUnionFind(Generic[T]):
+    def __init__(self, nodes: Sequence[T]):
+        """ Union by weight only: no path compression, so every union can be undone """
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.parent = list(range(len(nodes)))
+        self.weight = [1] * len(nodes)
+        self.history: list[tuple[int, int]] = []
+
+    def find(self, i: T) -> int:
+        """ Return the index of the root of i's component """
+        k = self.index[i]
+        while self.parent[k] != k:
+            k = self.parent[k]
+        return k
+
+    def connected(self, i: T, j: T) -> bool:
+        return self.find(i) == self.find(j)
+
+    def union(self, i: T, j: T) -> bool:
+        """ Returns true if union is successful. Otherwise, false. """
+        i_parent = self.find(i)
+        j_parent = self.find(j)
+
+        if i_parent == j_parent:
+            return False
+
+        if self.weight[i_parent] > self.weight[j_parent]:
+            i_parent, j_parent = j_parent, i_parent
+
+        self.parent[i_parent] = j_parent
+        self.weight[j_parent] += self.weight[i_parent]
+        self.history.append((i_parent, j_parent))
+
+        return True
+
+    def rollback(self, snapshot: int) -> None:
+        """ Undo unions until only the first snapshot of them remain """
+        while len(self.history) > snapshot:
+            i_parent, j_parent = self.history.pop()
+            self.parent[i_parent] = i_parent
+            self.weight[j_parent] -= self.weight[i_parent]
+
+def rev_del_mst_edges(nodes: Sequence[T], edges: Sequence[Edge[T]]) -> list[Edge[T]]:
+    # Reverse-delete decides the edges heaviest first: edge t is deleted iff its endpoints stay
+    # connected without it. So at time t the graph holds every edge that has not been decided
+    # yet (except t itself) plus the decided edges that were kept.
+    #
+    # Offline dynamic connectivity over that timeline: edge s is alive during [0, s), and if it
+    # is kept, also during [s + 1, m). Each alive interval is stored on O(log m) segment tree
+    # nodes, and a DFS over the tree unions a node's edges on the way down and rolls them back
+    # on the way up, so leaf t sees exactly the graph at time t. Interval [s + 1, m) is only
+    # added once the DFS reaches leaf s, which is fine since it lies entirely to the right.
+    #
+    # O(e log e log n) overall.
+    sorted_edges = sorted(edges, key=lambda x: x.weight, reverse=True)
+    m = len(sorted_edges)
+    if m == 0:
+        return []
+
+    seg: list[list[int]] = [[] for _ in range(4 * m)]
+
+    def add(node: int, lo: int, hi: int, l: int, r: int, s: int) -> None:
+        # alive during [l, r), node covers [lo, hi)
+        if r <= lo or hi <= l:
+            return
+        if l <= lo and hi <= r:
+            seg[node].append(s)
+            return
+        mid = (lo + hi) // 2
+        add(2 * node, lo, mid, l, r, s)
+        add(2 * node + 1, mid, hi, l, r, s)
+
+    for s in range(m):
+        add(1, 0, m, 0, s, s)
+
+    ruf = RollBackUnionFind(nodes)
+    kept = [False] * m
+
+    def dfs(node: int, lo: int, hi: int) -> None:
+        snapshot = len(ruf.history)
+        for s in seg[node]:
+            ruf.union(sorted_edges[s].x, sorted_edges[s].y)
+
+        if hi - lo == 1:
+            edge = sorted_edges[lo]
+            if not ruf.connected(edge.x, edge.y):
+                kept[lo] = True
+                add(1, 0, m, lo + 1, m, lo)
+        else:
+            mid = (lo + hi) // 2
+            dfs(2 * node, lo, mid)
+            dfs(2 * node + 1, mid, hi)
+
+        ruf.rollback(snapshot)
+
+    dfs(1, 0, m)
+
+    return [edge for edge, keep in zip(sorted_edges, kept) if keep]
+
+def rev_del_mst_cost(nodes: Sequence[T], edges: Sequence[Edge[T]]) -> int:
+    return sum(edge.weight for edge in rev_del_mst_edges(nodes, edges))
+
+print(rev_del_mst_cost([0, 1, 2, 3, 4], [
+            Edge(0, 1, 4),
+            Edge(1, 2, 2),
+            Edge(0, 2, 4),
+            Edge(0, 3, 6),
+            Edge(2 ,3, 8),
+            Edge(0, 4, 6),
+            Edge(3, 4, 9),
+        ]))
+
+if __name__ == "__main__":
+    # benchmark against the other two reverse-delete versions on random connected graphs
+    import importlib.util
+    from random import Random
+    from time import perf_counter
+
+    def load(path: str):
+        spec = importlib.util.spec_from_file_location(path.removesuffix(".py"), path)
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    others = {path: load(path).rev_del_mst_cost for path in ["reverse_delete_O(e^2).py", "reverse_delete_O(e log e).py"]}
+
+    rand = Random(33)
+    for n, e in [(50, 200), (200, 1000), (500, 3000)]:
+        nodes = list(range(n))
+        edges = [Edge(i, rand.randrange(i), rand.randint(1, 10**6)) for i in range(1, n)]
+        edges += [Edge(rand.randrange(n), rand.randrange(n), rand.randint(1, 10**6)) for _ in range(e - (n - 1))]
+
+        start = perf_counter()
+        cost = rev_del_mst_cost(nodes, edges)
+        print(f"n={n} e={e}: O(e log^2 e) cost={cost} {perf_counter() - start:.3f}s")
+
+        for path, other in others.items():
+            start = perf_counter()
+            other_cost = other(nodes, edges)
+            print(f"n={n} e={e}: {path} cost={other_cost} {perf_counter() - start:.3f}s")
@@ -1,8 +1,10 @@
 # type: ignore
 
+from array import array
 from collections.abc import Iterable, Sequence
 
-from utils import Edge
+from utils import Edge, EdgeList, INF
+from kruskal import ConnectedComponents
 
 def mst_edges[T](nodes: Sequence[T], edges: Sequence[Edge]) -> Iterable[Edge]:
 
@@ -64,6 +66,79 @@ def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge]) -> int:
     return sum(edge.cost for edge in mst_edges(nodes, edges))
 
 
+def mst_edges_contracted[T](nodes: Sequence[T], edges: Sequence[Edge] | EdgeList) -> Iterable[Edge]:
+    # boruvka on a contracted graph: after each round, every component becomes a single node and
+    # only the cheapest edge between each pair of components survives, so later rounds get smaller.
+    # nodes are 0, 1, ..., n-1. tie-break by edge index, so the tree is the same one kruskal finds.
+    #
+    # every edge carries one int key, cost*m + original index, so "cheaper, ties by index" is a
+    # single int comparison, and the cheapest edge away from each component is kept in a flat
+    # list indexed by component instead of a dict of (cost, index) tuples
+    cols = edges if isinstance(edges, EdgeList) else EdgeList.from_edges(edges)
+    m = len(cols)
+    comps = ConnectedComponents(nodes)
+
+    # contracted graph as parallel lists: endpoints are component ids, keys as above.
+    # self-loops can never be in the tree, so they are dropped up front
+    cur_i = []
+    cur_j = []
+    keys = []
+    for x, (a, b, c) in enumerate(zip(cols.i, cols.j, cols.cost)):
+        if a != b:
+            cur_i.append(a)
+            cur_j.append(b)
+            keys.append(c*m + x)
+
+    # rep[c] is some original node inside component c
+    rep = array('i', range(len(nodes)))
+
+    while keys:
+        # get minimum edge away from each component
+        best = [INF]*len(rep)
+        for a, b, key in zip(cur_i, cur_j, keys):
+            if key < best[a]:
+                best[a] = key
+            if key < best[b]:
+                best[b] = key
+
+        for x in sorted({key % m for key in best if key != INF}):
+            if comps.union(cols.i[x], cols.j[x]):
+                yield edges[x]
+
+        # contract: relabel the merged components as 0, 1, ..., k-1
+        label = {}
+        relabel = array('i')
+        new_rep = array('i')
+        for node in rep:
+            root = comps.find(node)
+            if root not in label:
+                label[root] = len(new_rep)
+                new_rep.append(root)
+            relabel.append(label[root])
+        rep = new_rep
+        k = len(rep)
+
+        # keep only inter-component edges, and only the cheapest among parallel ones,
+        # keyed by the component pair packed into one int
+        keep = {}
+        for a, b, key in zip(cur_i, cur_j, keys):
+            a = relabel[a]
+            b = relabel[b]
+            if a == b:
+                continue
+            pair = a*k + b if a < b else b*k + a
+            if key < keep.get(pair, INF):
+                keep[pair] = key
+
+        cur_i = [pair // k for pair in keep]
+        cur_j = [pair % k for pair in keep]
+        keys = [*keep.values()]
+
+
+def mst_cost_contracted[T](nodes: Sequence[T], edges: Sequence[Edge] | EdgeList) -> int:
+    return sum(edge.cost for edge in mst_edges_contracted(nodes, edges))
+
+
 assert mst_cost(range(5), [
         Edge(0, 1, 4),
         Edge(1, 2, 2),
@@ -74,6 +149,16 @@ assert mst_cost(range(5), [
         Edge(3, 4, 9),
     ]) == 18
 
+assert mst_cost_contracted(range(5), [
+        Edge(0, 1, 4),
+        Edge(1, 2, 2),
+        Edge(0, 2, 4),
+        Edge(0, 3, 6),
+        Edge(2 ,3, 8),
+        Edge(0, 4, 6),
+        Edge(3, 4, 9),
+    ]) == 18
+
 if __name__ == '__main__':
     for edge in mst_edges(range(5), [
             Edge(0, 1, 4),
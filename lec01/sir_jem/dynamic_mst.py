@@ -0,0 +1,281 @@
+# type: ignore
+
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Sequence
+
+from utils import Edge, INF
+
+
+class LinkCutTree:
+    # forest of rooted trees, each stored as splay trees over its preferred paths.
+    # every node carries a value, and path_max returns the node with the largest value on a path.
+    # all operations are amortized O(log n)
+    def __init__(self):
+        self.left = []
+        self.right = []
+        self.parent = []
+        self.flip = []
+        self.val = []
+        self.best = []
+
+    def add_node(self, val) -> int:
+        x = len(self.val)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(-1)
+        self.flip.append(False)
+        self.val.append(val)
+        self.best.append(x)
+        return x
+
+    def _is_root(self, x):
+        # root of its splay tree, i.e. not the left/right child of its parent pointer
+        p = self.parent[x]
+        return p < 0 or (self.left[p] != x and self.right[p] != x)
+
+    def _push(self, x):
+        if self.flip[x]:
+            l, r = self.left[x], self.right[x]
+            self.left[x], self.right[x] = r, l
+            if l >= 0:
+                self.flip[l] = not self.flip[l]
+            if r >= 0:
+                self.flip[r] = not self.flip[r]
+            self.flip[x] = False
+
+    def _pull(self, x):
+        val, best = self.val, self.best
+        b = x
+        l, r = self.left[x], self.right[x]
+        if l >= 0 and val[best[l]] > val[b]:
+            b = best[l]
+        if r >= 0 and val[best[r]] > val[b]:
+            b = best[r]
+        best[x] = b
+
+    def _rotate(self, x):
+        left, right, parent = self.left, self.right, self.parent
+        p = parent[x]
+        g = parent[p]
+        p_is_root = self._is_root(p)
+
+        if left[p] == x:
+            b = right[x]
+            left[p] = b
+            right[x] = p
+        else:
+            b = left[x]
+            right[p] = b
+            left[x] = p
+        if b >= 0:
+            parent[b] = p
+
+        if not p_is_root:
+            if left[g] == p:
+                left[g] = x
+            else:
+                right[g] = x
+        parent[x] = g
+        parent[p] = x
+
+        self._pull(p)
+        self._pull(x)
+
+    def _splay(self, x):
+        # push pending flips top-down first, then rotate x up to the root of its splay tree
+        path = [x]
+        while not self._is_root(path[-1]):
+            path.append(self.parent[path[-1]])
+        for y in reversed(path):
+            self._push(y)
+
+        left, parent = self.left, self.parent
+        while not self._is_root(x):
+            p = parent[x]
+            if not self._is_root(p):
+                g = parent[p]
+                if (left[g] == p) == (left[p] == x):
+                    self._rotate(p)
+                else:
+                    self._rotate(x)
+            self._rotate(x)
+
+    def _access(self, x):
+        # make the root-to-x path preferred, with x at the root of its splay tree
+        last = -1
+        y = x
+        while y >= 0:
+            self._splay(y)
+            self.right[y] = last
+            self._pull(y)
+            last = y
+            y = self.parent[y]
+        self._splay(x)
+
+    def make_root(self, x):
+        self._access(x)
+        self.flip[x] = not self.flip[x]
+
+    def find_root(self, x):
+        self._access(x)
+        while True:
+            self._push(x)
+            if self.left[x] < 0:
+                break
+            x = self.left[x]
+        self._splay(x)
+        return x
+
+    def connected(self, x, y):
+        return self.find_root(x) == self.find_root(y)
+
+    def link(self, x, y):
+        # x and y must be in different trees
+        self.make_root(x)
+        self.parent[x] = y
+
+    def cut(self, x, y):
+        # x and y must be adjacent
+        self.make_root(x)
+        self._access(y)
+        self.left[y] = -1
+        self.parent[x] = -1
+        self._pull(y)
+
+    def path_max(self, x, y):
+        # node with the largest value on the path between x and y (which must be connected)
+        self.make_root(x)
+        self._access(y)
+        return self.best[y]
+
+
+class DynamicMST[T]:
+    # minimum spanning forest under edge insertions and deletions, without rebuilding.
+    # the forest lives in a link-cut tree where every edge is its own node between its endpoints,
+    # valued by its cost, so the max edge on a cycle is a single path_max query.
+    #
+    # insert: O(log n). if the new edge closes a cycle, it replaces the max edge on that cycle.
+    # delete: O(log n) plus the spare list update for a non-tree edge. a tree edge is cut, then
+    # replaced by the cheapest non-tree edge that reconnects the two halves. the non-tree edges
+    # are kept sorted by cost, so that search walks them from the cost of the cut edge up and
+    # stops at the first one that crosses: one connected query per spare edge whose cost is
+    # between the cut edge and its replacement, at worst every spare edge.
+    #
+    # nodes are 0, 1, ..., n-1.
+    def __init__(self, nodes: Sequence[T]):
+        self.n = len(nodes)
+        self.lct = LinkCutTree()
+        for _ in range(self.n):
+            self.lct.add_node(-INF)
+
+        self.edges = []     # edge id -> Edge, None once deleted
+        self.in_tree = []   # edge id -> whether the edge is in the forest
+        self.spare = []     # (cost, id) of the live edges not in the forest, sorted
+        self.cost = 0
+
+    def _link(self, eid):
+        edge = self.edges[eid]
+        x = self.n + eid
+        self.lct.link(edge.i, x)
+        self.lct.link(x, edge.j)
+        self.in_tree[eid] = True
+        self.cost += edge.cost
+
+    def _cut(self, eid):
+        edge = self.edges[eid]
+        x = self.n + eid
+        self.lct.cut(edge.i, x)
+        self.lct.cut(x, edge.j)
+        self.in_tree[eid] = False
+        self.cost -= edge.cost
+
+    def _add_spare(self, eid):
+        insort(self.spare, (self.edges[eid].cost, eid))
+
+    def _remove_spare(self, eid):
+        k = bisect_left(self.spare, (self.edges[eid].cost, eid))
+        assert self.spare[k][1] == eid
+        del self.spare[k]
+
+    def insert(self, edge: Edge) -> int:
+        # returns the id of the new edge, to be passed to delete
+        eid = len(self.edges)
+        self.edges.append(edge)
+        self.in_tree.append(False)
+        self.lct.add_node(edge.cost)
+
+        if edge.i == edge.j:
+            self._add_spare(eid)
+        elif not self.lct.connected(edge.i, edge.j):
+            self._link(eid)
+        else:
+            worst = self.lct.path_max(edge.i, edge.j) - self.n
+            if self.edges[worst].cost > edge.cost:
+                self._cut(worst)
+                self._add_spare(worst)
+                self._link(eid)
+            else:
+                self._add_spare(eid)
+
+        return eid
+
+    def delete(self, eid: int):
+        assert self.edges[eid] is not None
+        if self.in_tree[eid]:
+            self._cut(eid)
+
+            # the cheapest spare edge across the cut, if any.
+            # every other spare edge still has both endpoints in the same tree.
+            # a spare edge is never cheaper than the tree edges on its cycle (or the forest would
+            # not be minimal), so one that crosses the cut costs at least as much as the cut edge:
+            # the scan starts there
+            spare = self.spare
+            k = bisect_left(spare, (self.edges[eid].cost, -1))
+            while k < len(spare):
+                edge = self.edges[spare[k][1]]
+                if not self.lct.connected(edge.i, edge.j):
+                    _, idx = spare.pop(k)
+                    self._link(idx)
+                    break
+                k += 1
+        else:
+            self._remove_spare(eid)
+
+        self.edges[eid] = None
+
+    def tree_edges(self) -> Iterable[Edge]:
+        return (edge for edge, in_tree in zip(self.edges, self.in_tree) if in_tree)
+
+
+def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge]) -> int:
+    mst = DynamicMST(nodes)
+    for edge in edges:
+        mst.insert(edge)
+    return mst.cost
+
+
+assert mst_cost(range(5), [
+        Edge(0, 1, 4),
+        Edge(1, 2, 2),
+        Edge(0, 2, 4),
+        Edge(0, 3, 6),
+        Edge(2 ,3, 8),
+        Edge(0, 4, 6),
+        Edge(3, 4, 9),
+    ]) == 18
+
+if __name__ == '__main__':
+    mst = DynamicMST(range(5))
+    ids = [mst.insert(edge) for edge in [
+            Edge(0, 1, 4),
+            Edge(1, 2, 2),
+            Edge(0, 2, 4),
+            Edge(0, 3, 6),
+            Edge(2 ,3, 8),
+            Edge(0, 4, 6),
+            Edge(3, 4, 9),
+        ]]
+    print(mst.cost, *mst.tree_edges())
+
+    mst.delete(ids[3])
+    print(mst.cost, *mst.tree_edges())
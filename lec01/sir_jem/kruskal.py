@@ -1,23 +1,25 @@
 # type: ignore
 
+from array import array
 from collections.abc import Sequence, Iterable
+from operator import attrgetter
 
-from utils import Edge
+from utils import Edge, EdgeList
 
 class ConnectedComponents[T]:
+    # nodes are assumed to be 0, 1, ..., n-1, so the whole state fits in two flat int arrays
     def __init__(self, nodes: Sequence[T]):
-        # self.comps: list[set[T]] = [{i} for i in nodes]
-        self.parent = {node: node for node in nodes}
-        self.weight = {node: 1 for node in nodes}
-        # super().__init__()
+        n = len(nodes)
+        self.parent = array('i', range(n))
+        self.weight = array('i', [1])*n
 
     def find(self, i: T):
-        # return next(idx for idx, comp in enumerate(self.comps) if i in comp)
-        if self.parent[i] == i:
-            return i
-        else:
-            self.parent[i] = self.find(self.parent[i])
-            return self.parent[i]
+        # iterative path halving: every node on the path skips to its grandparent
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
 
     def union(self, i, j):
         # returns True if union is successful, false otherwise
@@ -40,24 +42,48 @@ class ConnectedComponents[T]:
 
         return True
 
-
-def mst_edges[T](nodes: Sequence[T], edges: Sequence[Edge]) -> Iterable[Edge]:
-    # sort the edges in increasing order of weight. (break ties arbitrarily)
-
+    def union_many(self, edges: Iterable[tuple[T, T]]) -> Iterable[int]:
+        # batched union over (i, j) pairs, e.g. zip(edge_i, edge_j) in sorted order.
+        # yields the position of every pair that merged two components.
+        # same as calling union on each pair, but with find inlined and no method lookups.
+        parent = self.parent
+        weight = self.weight
+        for idx, (i, j) in enumerate(edges):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            while parent[j] != j:
+                parent[j] = parent[parent[j]]
+                j = parent[j]
+            if i == j:
+                continue
+
+            if weight[i] > weight[j]:
+                i, j = j, i
+
+            parent[i] = j
+            weight[j] += weight[i]
+            yield idx
+
+
+def mst_edges[T](nodes: Sequence[T], edges: Sequence[Edge] | EdgeList) -> Iterable[Edge]:
+    # sort the edges in increasing order of weight. (break ties by edge index)
     comps = ConnectedComponents(nodes)
 
-    edges_chosen = []
-    for edge in sorted(edges, key=lambda edge: edge.cost):
-        if comps.union(edge.i, edge.j):
-            edges_chosen.append(edge)
-            yield edge
-
-        # # verify if you want
-        # assert connected_components(nodes, edges) == connected_components(nodes, edges_chosen)
-
+    if isinstance(edges, EdgeList):
+        order = edges.argsort_by_cost()
+        sorted_i = map(edges.i.__getitem__, order)
+        sorted_j = map(edges.j.__getitem__, order)
+        for idx in comps.union_many(zip(sorted_i, sorted_j)):
+            yield edges[order[idx]]
+    else:
+        # plain Edge objects are sorted as they are, rather than converted to columns first
+        sorted_edges = sorted(edges, key=attrgetter('cost'))
+        for idx in comps.union_many((edge.i, edge.j) for edge in sorted_edges):
+            yield sorted_edges[idx]
 
 
-def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge]) -> int:
+def mst_cost[T](nodes: Sequence[T], edges: Sequence[Edge] | EdgeList) -> int:
     return sum(edge.cost for edge in mst_edges(nodes, edges))
 
 
@@ -0,0 +1,168 @@
+# type: ignore
+
+import os
+from array import array
+from collections.abc import Iterable, Sequence
+from heapq import merge
+from itertools import islice
+from mmap import mmap, ACCESS_READ
+from tempfile import TemporaryDirectory
+
+from utils import Edge, EdgeList
+from kruskal import ConnectedComponents
+
+# edge files are flat native int64 triples (i, j, cost), one triple per edge
+# sorted runs are flat int64 triples (cost, i, j), so they merge by plain tuple comparison
+CHUNK_SIZE = 1 << 20
+RUN_BLOCK_SIZE = 1 << 12
+
+# at most this many runs are merged (and open) at once; more runs are merged in several passes
+MAX_FAN_IN = 64
+
+
+def write_edges(path, edges: Iterable[Edge], chunk_size: int=CHUNK_SIZE):
+    with open(path, 'wb') as f:
+        edges = iter(edges)
+        while chunk := [*islice(edges, chunk_size)]:
+            flat = array('q')
+            for edge in chunk:
+                flat.extend((edge.i, edge.j, edge.cost))
+            flat.tofile(f)
+
+
+def read_edges_binary(path, chunk_size: int=CHUNK_SIZE) -> Iterable[EdgeList]:
+    # memory-map the edge file and hand it out chunk_size edges at a time
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as f, mmap(f.fileno(), 0, access=ACCESS_READ) as mm:
+        flat = memoryview(mm).cast('q')
+        try:
+            for lo in range(0, len(flat), 3*chunk_size):
+                # the EdgeList copies out of the view, which is released before the yield, so a
+                # consumer that stops early leaves no view of the mmap behind
+                with flat[lo:lo + 3*chunk_size] as part:
+                    chunk = EdgeList(part[0::3], part[1::3], part[2::3])
+                yield chunk
+        finally:
+            flat.release()
+
+
+def read_edges_text(path, chunk_size: int=CHUNK_SIZE) -> Iterable[EdgeList]:
+    # one "i j cost" edge per line; blank lines are skipped
+    with open(path) as f:
+        while lines := [*islice(f, chunk_size)]:
+            chunk = EdgeList()
+            for line in lines:
+                if line.strip():
+                    i, j, cost = map(int, line.split())
+                    chunk.append(i, j, cost)
+            if chunk:
+                yield chunk
+
+
+def sorted_runs(chunks: Iterable[EdgeList], tmpdir) -> list[str]:
+    # sort each chunk by cost in memory and write it out as its own run
+    paths = []
+    for chunk in chunks:
+        run = array('q')
+        for idx in chunk.argsort_by_cost():
+            run.extend((chunk.cost[idx], chunk.i[idx], chunk.j[idx]))
+        path = os.path.join(tmpdir, f'run{len(paths)}.bin')
+        with open(path, 'wb') as f:
+            run.tofile(f)
+        paths.append(path)
+    return paths
+
+
+def read_run(path, block_size: int=RUN_BLOCK_SIZE) -> Iterable[tuple[int, int, int]]:
+    # (cost, i, j) triples of a sorted run, reading only block_size edges at a time
+    with open(path, 'rb') as f:
+        while True:
+            block = array('q')
+            try:
+                block.fromfile(f, 3*block_size)
+            except EOFError:
+                # fromfile still keeps whatever was left at the end of the file
+                pass
+            if not block:
+                return
+            yield from zip(block[0::3], block[1::3], block[2::3])
+
+
+def write_run(path, triples: Iterable[tuple[int, int, int]], block_size: int=RUN_BLOCK_SIZE):
+    with open(path, 'wb') as f:
+        triples = iter(triples)
+        while block := [*islice(triples, block_size)]:
+            flat = array('q')
+            for triple in block:
+                flat.extend(triple)
+            flat.tofile(f)
+
+
+def merge_runs(paths: list[str], tmpdir, fan_in: int=MAX_FAN_IN) -> list[str]:
+    # merge groups of fan_in runs into longer runs until at most fan_in are left,
+    # so no more than fan_in run files are ever open at once
+    assert fan_in >= 2
+    passes = 0
+    while len(paths) > fan_in:
+        merged = []
+        for lo in range(0, len(paths), fan_in):
+            group = paths[lo:lo + fan_in]
+            path = os.path.join(tmpdir, f'merge{passes}_{len(merged)}.bin')
+            write_run(path, merge(*map(read_run, group)))
+            for old in group:
+                os.remove(old)
+            merged.append(path)
+        paths = merged
+        passes += 1
+    return paths
+
+
+def mst_edges_stream[T](nodes: Sequence[T], chunks: Iterable[EdgeList], *, tmpdir=None, fan_in: int=MAX_FAN_IN) -> Iterable[Edge]:
+    # external-memory kruskal: sort the chunks into runs on disk, then k-way merge the runs
+    # into the union-find. only the union-find, one chunk, and a block per run (at most fan_in
+    # runs) are ever in memory. nodes are 0, 1, ..., n-1.
+    comps = ConnectedComponents(nodes)
+
+    with TemporaryDirectory(dir=tmpdir) as rundir:
+        runs = [read_run(path) for path in merge_runs(sorted_runs(chunks, rundir), rundir, fan_in)]
+        try:
+            needed = len(nodes) - 1
+            for cost, i, j in merge(*runs):
+                if needed <= 0:
+                    break
+                if comps.union(i, j):
+                    needed -= 1
+                    yield Edge(i, j, cost)
+        finally:
+            # close the run files before their directory goes
+            for run in runs:
+                run.close()
+
+
+def mst_cost_stream[T](nodes: Sequence[T], edges: Iterable[Edge], chunk_size: int=CHUNK_SIZE, fan_in: int=MAX_FAN_IN) -> int:
+    # round trip through an edge file, mostly for cross-checking against kruskal
+    with TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'edges.bin')
+        write_edges(path, edges, chunk_size)
+        chunks = read_edges_binary(path, chunk_size)
+        return sum(edge.cost for edge in mst_edges_stream(nodes, chunks, tmpdir=tmpdir, fan_in=fan_in))
+
+
+assert mst_cost_stream(range(5), [
+        Edge(0, 1, 4),
+        Edge(1, 2, 2),
+        Edge(0, 2, 4),
+        Edge(0, 3, 6),
+        Edge(2 ,3, 8),
+        Edge(0, 4, 6),
+        Edge(3, 4, 9),
+    ], chunk_size=2) == 18
+
+if __name__ == '__main__':
+    import sys
+
+    # usage: python kruskal_stream.py n edges.txt
+    n = int(sys.argv[1])
+    for edge in mst_edges_stream(range(n), read_edges_text(sys.argv[2])):
+        print(edge)
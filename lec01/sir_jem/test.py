@@ -1,13 +1,42 @@
 # type: ignore
 
+import os
 from random import Random
+from tempfile import TemporaryDirectory
 
-from utils import Edge, shuffled
+from utils import Edge, EdgeList, shuffled
 
 from kruskal import mst_cost as mst_cost_kruskal
+from kruskal_stream import mst_cost_stream as mst_cost_kruskal_stream
+from kruskal_stream import write_edges, read_edges_binary, read_edges_text
 from prim import mst_cost as mst_cost_prim
 from prim2 import mst_cost as mst_cost_prim2
+from prim3 import mst_cost as mst_cost_prim3
 from boruvka import mst_cost as mst_cost_boruvka
+from boruvka import mst_cost_contracted as mst_cost_boruvka_contracted
+from dynamic_mst import DynamicMST
+
+
+def check_edge_readers(rand, edges):
+    # both readers give back the edges, and stopping partway through must not leave the file busy
+    with TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'edges.bin')
+        write_edges(path, edges)
+        chunk_size = rand.randint(1, 5)
+        assert [edge for chunk in read_edges_binary(path, chunk_size) for edge in chunk] == edges
+        for chunk in read_edges_binary(path, chunk_size):
+            break
+        chunks = read_edges_binary(path, chunk_size)
+        next(chunks, None)
+        chunks.close()
+
+        # text, with blank lines scattered in
+        path = os.path.join(tmpdir, 'edges.txt')
+        with open(path, 'w') as f:
+            for edge in edges:
+                f.write('\n'*rand.randint(0, 2) + f"{edge.i} {edge.j} {edge.cost}\n")
+            f.write('\n')
+        assert [edge for chunk in read_edges_text(path, chunk_size) for edge in chunk] == edges
 
 
 def main():
@@ -51,13 +80,31 @@ def main():
         #     print('    edge:', edge)
 
         cost_kruskal = mst_cost_kruskal(nodes, edges)
+        assert mst_cost_kruskal(nodes, EdgeList.from_edges(edges)) == cost_kruskal
+        # tiny chunks and a fan-in of 2, so that the runs are merged in several passes
+        cost_kruskal_stream = mst_cost_kruskal_stream(nodes, edges, chunk_size=4, fan_in=2)
         cost_prim = mst_cost_prim(nodes, edges)
         cost_prim2 = mst_cost_prim2(nodes, edges)
+        cost_prim3 = mst_cost_prim3(nodes, edges)
         cost_boruvka = mst_cost_boruvka(nodes, edges)
+        cost_boruvka_contracted = mst_cost_boruvka_contracted(nodes, edges)
 
-        print("The mst cost is", cost_kruskal, cost_prim, cost_prim2, cost_boruvka)
+        check_edge_readers(rand, edges)
 
-        assert cost_kruskal == cost_prim == cost_prim2 == cost_boruvka
+        dynamic = DynamicMST(nodes)
+        ids = [dynamic.insert(edge) for edge in edges]
+        cost_dynamic = dynamic.cost
+
+        print("The mst cost is", cost_kruskal, cost_kruskal_stream, cost_prim, cost_prim2, cost_prim3, cost_boruvka, cost_boruvka_contracted, cost_dynamic)
+
+        assert cost_kruskal == cost_kruskal_stream == cost_prim == cost_prim2 == cost_prim3 == cost_boruvka == cost_boruvka_contracted == cost_dynamic
+
+        # delete some edges, comparing against kruskal on the remaining ones after each delete
+        deleted = set()
+        for idx in rand.sample(range(len(edges)), rand.randint(0, len(edges))):
+            dynamic.delete(ids[idx])
+            deleted.add(idx)
+            assert dynamic.cost == mst_cost_kruskal(nodes, [edge for idx, edge in enumerate(edges) if idx not in deleted])
 
 
 if __name__ == '__main__':
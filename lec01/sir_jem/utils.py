@@ -1,7 +1,11 @@
 # type: ignore
 
+from array import array
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 
+INF = float('inf')
+
 @dataclass
 class Edge:
     i: int
@@ -9,6 +13,56 @@ class Edge:
     cost: int
 
 
+class EdgeList:
+    # columnar edges: parallel i, j, cost arrays instead of one Edge object per edge.
+    # EdgeList[idx] and iteration still hand out Edge objects, so it can be passed
+    # anywhere a Sequence[Edge] is expected.
+    def __init__(self, i: Iterable[int]=(), j: Iterable[int]=(), cost: Iterable[int]=()):
+        self.i = array('i', i)
+        self.j = array('i', j)
+        self.cost = array('q', cost)
+        assert len(self.i) == len(self.j) == len(self.cost)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Edge]):
+        res = cls()
+        for edge in edges:
+            res.append(edge.i, edge.j, edge.cost)
+        return res
+
+    def to_edges(self) -> list[Edge]:
+        return [*self]
+
+    def append(self, i: int, j: int, cost: int):
+        self.i.append(i)
+        self.j.append(j)
+        self.cost.append(cost)
+
+    def __len__(self):
+        return len(self.cost)
+
+    def __getitem__(self, idx: int) -> Edge:
+        return Edge(self.i[idx], self.j[idx], self.cost[idx])
+
+    def __iter__(self):
+        return map(Edge, self.i, self.j, self.cost)
+
+    def argsort_by_cost(self) -> array:
+        # edge indices in increasing order of cost, ties broken by edge index (the sort is stable).
+        # the key is still called once per index, but it is the array's own C-level __getitem__
+        # rather than a lambda. (packing (cost, idx) into one int to sort without a key was slower)
+        return array('q', sorted(range(len(self.cost)), key=self.cost.__getitem__))
+
+    def take(self, idxs: Iterable[int]):
+        # the edges at the given indices, in that order
+        idxs = [*idxs]
+        return EdgeList(
+            map(self.i.__getitem__, idxs),
+            map(self.j.__getitem__, idxs),
+            map(self.cost.__getitem__, idxs),
+        )
+
+
 # TODO subclass random.Random in the future
 def shuffled(rand, seq):
     seq = [*seq]
@@ -24,3 +78,81 @@ def make_adjacency_list(nodes, edges):
         adj[edge.j].append((edge.i, edge.cost))
 
     return adj
+
+
+class IndexedMinHeap:
+    # binary min-heap over the items 0, 1, ..., n-1, each present at most once.
+    # pos[i] is where item i sits in the heap (-1 if absent), so decrease_key is O(log n)
+    # and the heap never holds more than n entries, unlike pushing duplicates into heapq.
+    # the same class is in lec02/02_shortest_path/utils.py (for shortest_path6); change both together.
+    def __init__(self, n: int):
+        self.heap = array('i')
+        self.pos = array('i', [-1])*n
+        self.key = [INF]*n
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, i: int):
+        return self.pos[i] >= 0
+
+    def push(self, i: int, key):
+        # insert i, or lower its key if it is already in the heap.
+        # returns True if the key of i changed
+        if self.pos[i] >= 0:
+            return self.decrease_key(i, key)
+        self.key[i] = key
+        self.heap.append(i)
+        self._sift_up(len(self.heap) - 1)
+        return True
+
+    def decrease_key(self, i: int, key):
+        assert self.pos[i] >= 0
+        if key >= self.key[i]:
+            return False
+        self.key[i] = key
+        self._sift_up(self.pos[i])
+        return True
+
+    def pop(self):
+        # remove and return (key, i) with the smallest key
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.pos[top] = -1
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return self.key[top], top
+
+    def _sift_up(self, loc):
+        heap, pos, key = self.heap, self.pos, self.key
+        i = heap[loc]
+        k = key[i]
+        while loc > 0:
+            parent = (loc - 1) // 2
+            p = heap[parent]
+            if key[p] <= k:
+                break
+            heap[loc] = p
+            pos[p] = loc
+            loc = parent
+        heap[loc] = i
+        pos[i] = loc
+
+    def _sift_down(self, loc):
+        heap, pos, key = self.heap, self.pos, self.key
+        n = len(heap)
+        i = heap[loc]
+        k = key[i]
+        while (son := loc * 2 + 1) < n:
+            if son + 1 < n and key[heap[son + 1]] < key[heap[son]]:
+                son += 1
+            s = heap[son]
+            if k <= key[s]:
+                break
+            heap[loc] = s
+            pos[s] = loc
+            loc = son
+        heap[loc] = i
+        pos[i] = loc
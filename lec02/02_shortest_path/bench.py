@@ -0,0 +1,242 @@
+# type: ignore
+
+# benchmark harness for the all-pairs shortest path solvers.
+# test.py checks that they agree; this times them on growing random, grid and scale-free
+# graphs, records the tracemalloc peak (where it means something), and writes a CSV or JSON report, e.g.
+#
+#     python bench.py --out report.csv
+#     python bench.py --family grid --sizes 16 64 256 --out report.json
+
+import csv
+import json
+import sys
+import tracemalloc
+
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from functools import partial
+from importlib.util import spec_from_file_location, module_from_spec
+from io import StringIO
+from math import isqrt
+from pathlib import Path
+from time import perf_counter
+
+from utils import Edge, CS33Random, INF
+
+from shortest_path1 import shortest_paths as sp1
+from shortest_path2 import shortest_paths as sp2
+from shortest_path3 import shortest_paths as sp3
+from shortest_path4 import shortest_paths as sp4
+from shortest_path5 import shortest_paths as sp5
+from shortest_path6 import shortest_paths as sp6
+from shortest_path_parallel import shortest_paths as sp_parallel, PARALLEL_MIN_NODES
+from shortest_path_floyd_numpy import shortest_paths as sp_floyd_numpy, BLOCK_SIZE
+from shortest_path_neg import shortest_paths as sp_neg
+from shortest_path_spfa import shortest_paths as sp_spfa
+from shortest_path_johnson import shortest_paths as sp_johnson
+from shortest_path_dial import shortest_paths as sp_dial
+
+
+# edges per node for the random family, and new edges per node for the scale-free family
+AVG_DEGREE = 4
+
+DEFAULT_SIZES = 8, 16, 32, 64, 128, 256, 512
+
+
+def load_lec02(name):
+    # the lec02 student solutions print at import and use their own utils.Edge(x, y, weight),
+    # so load them under a private name with the parent utils swapped in, and with stdout muted
+    lec02 = Path(__file__).resolve().parent.parent
+    ours = sys.modules.pop('utils')
+    sys.path.insert(0, str(lec02))
+    try:
+        spec = spec_from_file_location(f'lec02_{name}', lec02 / f'{name}.py')
+        module = module_from_spec(spec)
+        with redirect_stdout(StringIO()):
+            spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(lec02))
+        sys.modules['utils'] = ours
+    return module
+
+
+lec02_bellman_ford = load_lec02('bellman_ford')
+lec02_floyd_warshal = load_lec02('floyd_warshal')
+
+
+def bellman_ford(n, edges):
+    module = lec02_bellman_ford
+    edges = [module.Edge(edge.i, edge.j, edge.cost) for edge in edges]
+    nodes = [*range(n)]
+
+    def row(x):
+        d = module.sssp_bellman_ford(nodes, edges, x)
+        return [d.get(i, INF) for i in range(n)]
+
+    with redirect_stdout(StringIO()):
+        return [row(x) for x in range(n)]
+
+
+def floyd_warshal(n, edges):
+    module = lec02_floyd_warshal
+    edges = [module.Edge(edge.i, edge.j, edge.cost) for edge in edges]
+    with redirect_stdout(StringIO()):
+        return module.apsp_floyd_warshall([*range(n)], edges)
+
+
+# name -> (solver, smallest and largest n it is run on, whether it reads the edges as directed).
+# the caps keep the exponential-memory and cubic solvers from eating the whole run; the
+# minimums skip sizes where a variant would only measure its fallback or its fixed overhead
+# (the process pool below PARALLEL_MIN_NODES, the blocked Floyd-Warshall within one tile)
+SOLVERS = {
+    'sp1': (sp1, 0, 64, True),
+    'sp2': (sp2, 0, 48, True),
+    'sp3': (sp3, 0, 64, True),
+    'sp4': (sp4, 0, 128, True),
+    'sp5': (sp5, 0, 512, True),
+    'sp6': (sp6, 0, 512, True),
+    'sp_parallel': (sp_parallel, PARALLEL_MIN_NODES, 512, True),
+    'sp_floyd_numpy': (sp_floyd_numpy, 16, 512, True),
+    'sp_floyd_numpy_blocked': (partial(sp_floyd_numpy, blocked=True), 2*BLOCK_SIZE, 512, True),
+    'sp_neg': (sp_neg, 0, 64, True),
+    'sp_spfa': (sp_spfa, 0, 256, True),
+    'sp_johnson': (sp_johnson, 0, 512, True),
+    'sp_johnson_pool': (partial(sp_johnson, workers=2), 128, 512, True),
+    'sp_dial': (sp_dial, 0, 512, True),
+    'bellman_ford': (bellman_ford, 0, 64, True),
+    'floyd_warshal': (floyd_warshal, 0, 128, False),
+}
+
+
+# tracemalloc only sees this process's Python allocations, so for these the peak would leave out
+# the pool workers and the shared-memory segments, which hold most of the memory. their peak is
+# reported as unavailable (None, an empty CSV cell) instead of a number that looks too good
+UNTRACED = {'sp_parallel', 'sp_johnson_pool'}
+
+
+def random_graph(rand, n):
+    nodes = range(n)
+
+    def rand_edge():
+        i, j = rand.choices(nodes, k=2)
+        return Edge(i, j, rand.randint(1, 100))
+
+    return n, [rand_edge() for _ in range(AVG_DEGREE*n)]
+
+
+def grid_graph(rand, n):
+    # side x side grid, both directions of every grid line, so n is rounded down to a square
+    side = max(1, isqrt(n))
+    edges = []
+    for r in range(side):
+        for c in range(side):
+            i = r*side + c
+            if c + 1 < side:
+                edges += Edge(i, i + 1, rand.randint(1, 100)), Edge(i + 1, i, rand.randint(1, 100))
+            if r + 1 < side:
+                edges += Edge(i, i + side, rand.randint(1, 100)), Edge(i + side, i, rand.randint(1, 100))
+    return side*side, rand.shuffled(edges)
+
+
+def scale_free_graph(rand, n):
+    # preferential attachment: each new node links to AVG_DEGREE earlier nodes picked with
+    # probability proportional to their degree (by sampling from the list of edge endpoints)
+    edges = []
+    ends = [0]
+    for i in range(1, n):
+        for j in {rand.choice(ends) for _ in range(AVG_DEGREE)}:
+            edges += Edge(i, j, rand.randint(1, 100)), Edge(j, i, rand.randint(1, 100))
+            ends += i, j
+    return n, rand.shuffled(edges)
+
+
+FAMILIES = {
+    'random': random_graph,
+    'grid': grid_graph,
+    'scale_free': scale_free_graph,
+}
+
+
+def measure(solve, n, edges, traced=True):
+    # one untraced run for the time (tracemalloc slows allocation down a lot),
+    # then a traced run for the peak memory unless traced is False
+    start = perf_counter()
+    answer = solve(n, edges)
+    seconds = perf_counter() - start
+
+    if not traced:
+        return answer, seconds, None
+
+    tracemalloc.start()
+    try:
+        solve(n, edges)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return answer, seconds, peak
+
+
+def run(families, sizes, solvers, seed=33):
+    for family in families:
+        for size in sizes:
+            n, edges = FAMILIES[family](CS33Random(seed), size)
+            expected = {}
+
+            for name in solvers:
+                solve, min_n, max_n, directed = SOLVERS[name]
+                if not min_n <= n <= max_n:
+                    continue
+
+                if directed not in expected:
+                    ref_edges = edges if directed else edges + [Edge(e.j, e.i, e.cost) for e in edges]
+                    expected[directed] = sp5(n, ref_edges)
+
+                answer, seconds, peak = measure(solve, n, edges, name not in UNTRACED)
+
+                yield {
+                    'family': family,
+                    'solver': name,
+                    'n': n,
+                    'e': len(edges),
+                    'seconds': seconds,
+                    'peak_bytes': peak,
+                    'ok': answer == expected[directed],
+                }
+
+
+def write_report(rows, path):
+    path = Path(path)
+    if path.suffix == '.json':
+        path.write_text(json.dumps(rows, indent=4) + '\n')
+    else:
+        with path.open('w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[*rows[0]] if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('--family', nargs='+', choices=[*FAMILIES], default=[*FAMILIES])
+    parser.add_argument('--solver', nargs='+', choices=[*SOLVERS], default=[*SOLVERS])
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--seed', type=int, default=33)
+    parser.add_argument('--out', help='report path; .json for JSON, anything else for CSV')
+    args = parser.parse_args()
+
+    rows = []
+    for row in run(args.family, args.sizes, args.solver, seed=args.seed):
+        peak = '      n/a    ' if row['peak_bytes'] is None else f"{row['peak_bytes']/2**20:9.2f} MiB"
+        print(f"{row['family']:>10} {row['solver']:>22} n={row['n']:<5} e={row['e']:<6} "
+              f"{row['seconds']:9.4f}s {peak} {'ok' if row['ok'] else 'MISMATCH'}")
+        rows.append(row)
+
+    if args.out:
+        write_report(rows, args.out)
+
+    assert all(row['ok'] for row in rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# type: ignore
+
+from utils import make_adjacency_list, Edge, IndexedMinHeap, INF
+
+
+def shortest_paths_from(n, edges, x):
+    # Dijkstra's algorithm with an indexed heap: each node is in the heap at most once
+    # and improvements go through decrease_key, so the heap stays O(n) even on dense graphs
+    adj = make_adjacency_list(n, edges, directed=True)
+
+    visited = [False]*n
+    dists = [INF]*n
+
+    pq = IndexedMinHeap(n)
+
+    pq.push(x, 0)
+
+    while pq:
+        (cost, i) = pq.pop()
+
+        visited[i] = True
+        dists[i] = cost
+
+        for j, c, edge in adj[i]:
+            if not visited[j]:
+                pq.push(j, cost + c)
+
+    return dists
+
+
+def shortest_paths(n, edges):
+    return [shortest_paths_from(n, edges, x) for x in range(n)]
+
+
+if __name__ == '__main__':
+    for row in shortest_paths(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(3, 1, 1),
+    ]):
+        print(row)
+
+    print()
+
+    # compare against the lazy-deletion heap of shortest_path5 on dense random graphs
+    from time import perf_counter
+
+    from utils import CS33Random
+    from shortest_path5 import shortest_paths_from as shortest_paths_from5
+
+    rand = CS33Random(33)
+    for n in 100, 300, 1000:
+        edges = [Edge(i, j, rand.randint(1, 10**9)) for i in range(n) for j in range(n) if i != j and rand.random() < .5]
+
+        start = perf_counter()
+        dists5 = shortest_paths_from5(n, edges, 0)
+        time5 = perf_counter() - start
+
+        start = perf_counter()
+        dists6 = shortest_paths_from(n, edges, 0)
+        time6 = perf_counter() - start
+
+        assert dists5 == dists6
+        print(f"{n=} e={len(edges)}: shortest_path5 {time5:.3f}s, shortest_path6 {time6:.3f}s")
@@ -0,0 +1,169 @@
+# type: ignore
+
+from collections import deque
+
+from utils import make_csr_adjacency, Edge, INF
+from shortest_path_parallel import shortest_paths_into
+
+# up to this max edge cost, Dial's bucket queue is used; above it, plain heapq.
+# (the radix heap is kept as an option, but in CPython it loses to heapq's C code for large costs)
+DIAL_MAX_COST = 1 << 10
+
+
+def zero_one_bfs(graph, x):
+    # costs are 0 or 1: a deque where 0-cost edges go to the front and 1-cost edges to the back
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dists = [INF]*len(graph)
+    dists[x] = 0
+
+    queue = deque([x])
+    while queue:
+        i = queue.popleft()
+        di = dists[i]
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            if di + weights[k] < dists[j]:
+                dists[j] = di + weights[k]
+                if weights[k]:
+                    queue.append(j)
+                else:
+                    queue.appendleft(j)
+
+    return dists
+
+
+def dial(graph, x, max_cost):
+    # Dial's algorithm: Dijkstra with one bucket per distance value. every pending distance is
+    # within max_cost of the current one, so max_cost + 1 buckets used circularly are enough.
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dists = [INF]*len(graph)
+    dists[x] = 0
+
+    size = max_cost + 1
+    buckets = [[] for _ in range(size)]
+    buckets[0].append(x)
+    pending = 1
+    d = 0
+    while pending:
+        bucket = buckets[d % size]
+        while bucket:
+            i = bucket.pop()
+            pending -= 1
+            if dists[i] != d:
+                # stale: i was improved after this entry was added
+                continue
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                if d + weights[k] < dists[j]:
+                    dists[j] = d + weights[k]
+                    buckets[dists[j] % size].append(j)
+                    pending += 1
+        d += 1
+
+    return dists
+
+
+def radix_heap(graph, x):
+    # Dijkstra with a radix heap. popped keys never decrease, so a key only needs to be compared
+    # with the last popped one: bucket b holds the keys whose highest bit differing from it is b.
+    # when bucket 0 runs dry, the first nonempty bucket is split down by its minimum.
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dists = [INF]*len(graph)
+    dists[x] = 0
+
+    buckets = [[] for _ in range(65)]
+    buckets[0].append((0, x))
+    pending = 1
+    last = 0
+    while pending:
+        if not buckets[0]:
+            b = 1
+            while not buckets[b]:
+                b += 1
+            moved = buckets[b]
+            buckets[b] = []
+            last = min(moved)[0]
+            for key, i in moved:
+                buckets[(key ^ last).bit_length()].append((key, i))
+
+        key, i = buckets[0].pop()
+        pending -= 1
+        if key != dists[i]:
+            continue
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            if key + weights[k] < dists[j]:
+                dists[j] = key + weights[k]
+                buckets[(dists[j] ^ last).bit_length()].append((dists[j], j))
+                pending += 1
+
+    return dists
+
+
+def _solver(graph):
+    # the bucket queues only work for non-negative costs; a negative edge would otherwise be
+    # taken as a 0-1 or small-cost graph and give wrong distances without any error
+    if min(graph.weights, default=0) < 0:
+        raise ValueError("shortest_path_dial needs non-negative costs; use shortest_path_spfa or shortest_path_johnson")
+    max_cost = max(graph.weights, default=0)
+    if max_cost <= 1:
+        return lambda x: zero_one_bfs(graph, x)
+    elif max_cost <= DIAL_MAX_COST:
+        return lambda x: dial(graph, x, max_cost)
+    else:
+        def heap(x):
+            dists = [INF]*len(graph)
+            shortest_paths_into(graph.offsets, graph.targets, graph.weights, x, dists)
+            return dists
+        return heap
+
+
+def shortest_paths_from(n, edges, x):
+    # costs must be non-negative integers. picks 0-1 BFS, Dial or heapq by the max cost
+    return _solver(make_csr_adjacency(n, edges, directed=True))(x)
+
+
+def shortest_paths(n, edges):
+    solve = _solver(make_csr_adjacency(n, edges, directed=True))
+    return [solve(x) for x in range(n)]
+
+
+if __name__ == '__main__':
+    for row in shortest_paths(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(3, 1, 1),
+    ]):
+        print(row)
+
+    print()
+
+    # throughput against heapq dijkstra: shortest_path5 as is, and the same CSR graph with heapq
+    from time import perf_counter
+
+    from utils import CS33Random
+    from shortest_path5 import shortest_paths_from as shortest_paths_from5
+
+    rand = CS33Random(33)
+    n = 10**5
+    for max_cost in 1, 10, 100, 10**9:
+        edges = [Edge(rand.randrange(n), rand.randrange(n), rand.randint(0 if max_cost == 1 else 1, max_cost)) for _ in range(5*n)]
+        graph = make_csr_adjacency(n, edges, directed=True)
+
+        start = perf_counter()
+        dists5 = shortest_paths_from5(n, edges, 0)
+        time5 = perf_counter() - start
+
+        start = perf_counter()
+        dists_heap = [INF]*n
+        shortest_paths_into(graph.offsets, graph.targets, graph.weights, 0, dists_heap)
+        time_heap = perf_counter() - start
+
+        start = perf_counter()
+        dists = zero_one_bfs(graph, 0) if max_cost == 1 else dial(graph, 0, max_cost) if max_cost <= DIAL_MAX_COST else radix_heap(graph, 0)
+        time_dial = perf_counter() - start
+
+        assert dists == dists5 == dists_heap
+        print(f"{max_cost=}: shortest_path5 {time5:.3f}s, csr heapq {time_heap:.3f}s, 0-1 bfs/dial/radix {time_dial:.3f}s")
@@ -0,0 +1,139 @@
+# type: ignore
+
+import numpy as np
+
+from utils import Edge, INF
+
+# tile size of the blocked variant: three float64 tiles of this size fit in L2
+BLOCK_SIZE = 128
+
+
+def distance_matrix(n, edges):
+    # like make_adjacency_matrix(directed=True), but as an n*n float64 array with a zero diagonal
+    d = np.full((n, n), INF)
+    if edges:
+        i = np.fromiter((edge.i for edge in edges), dtype=np.int64, count=len(edges))
+        j = np.fromiter((edge.j for edge in edges), dtype=np.int64, count=len(edges))
+        cost = np.fromiter((edge.cost for edge in edges), dtype=np.float64, count=len(edges))
+        np.minimum.at(d, (i, j), cost)
+    np.fill_diagonal(d, 0)
+    return d
+
+
+def floyd_warshall(d):
+    # Floyd's algorithm in place, one vectorized update per k
+    for k in range(len(d)):
+        np.minimum(d, d[:, k, None] + d[None, k, :], out=d)
+    return d
+
+
+def floyd_warshall_blocked(d, block=BLOCK_SIZE):
+    # cache-blocked Floyd's algorithm in place. for every block K of intermediate nodes:
+    # 1. run Floyd on the diagonal tile (K, K)
+    # 2. relax the row strip (K, :) and column strip (:, K) through K
+    # 3. relax every other tile (I, J) through K, one tile at a time, so it stays in cache
+    n = len(d)
+    for kb in range(0, n, block):
+        K = slice(kb, min(kb + block, n))
+        ks = range(K.start, K.stop)
+
+        diag = d[K, K]
+        for k in ks:
+            np.minimum(diag, diag[:, k - kb, None] + diag[None, k - kb, :], out=diag)
+
+        row = d[K, :]
+        col = d[:, K]
+        for k in ks:
+            np.minimum(row, diag[:, k - kb, None] + row[None, k - kb, :], out=row)
+            np.minimum(col, col[:, k - kb, None] + diag[None, k - kb, :], out=col)
+
+        for ib in range(0, n, block):
+            I = slice(ib, min(ib + block, n))
+            for jb in range(0, n, block):
+                J = slice(jb, min(jb + block, n))
+                if I == K or J == K:
+                    continue
+                tile = d[I, J]
+                left = d[I, K]
+                top = d[K, J]
+                for k in range(len(ks)):
+                    np.minimum(tile, left[:, k, None] + top[None, k, :], out=tile)
+
+    return d
+
+
+def floyd_warshall_with_next(d):
+    # Floyd's algorithm in place, also filling nxt[i][j]: the node after i on a shortest
+    # i -> j path, or -1 if there is none
+    n = len(d)
+    nxt = np.where(d < INF, np.arange(n)[None, :], -1)
+    for k in range(n):
+        through = d[:, k, None] + d[None, k, :]
+        better = through < d
+        np.copyto(d, through, where=better)
+        np.copyto(nxt, np.broadcast_to(nxt[:, k, None], (n, n)), where=better)
+    return d, nxt
+
+
+def reconstruct_path(nxt, i, j):
+    if nxt[i, j] < 0:
+        return None
+    path = [i]
+    while i != j:
+        i = int(nxt[i, j])
+        path.append(i)
+    return path
+
+
+def shortest_paths(n, edges, *, blocked=False):
+    d = distance_matrix(n, edges)
+    if blocked:
+        floyd_warshall_blocked(d)
+    else:
+        floyd_warshall(d)
+    return d.tolist()
+
+
+if __name__ == '__main__':
+    for row in shortest_paths(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(3, 1, 1),
+    ]):
+        print(row)
+
+    print()
+
+    d, nxt = floyd_warshall_with_next(distance_matrix(9, [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ]))
+    print(d[0, 6], reconstruct_path(nxt, 0, 6))
+
+    print()
+
+    from time import perf_counter
+
+    from utils import CS33Random
+
+    rand = CS33Random(33)
+    n = 2000
+    edges = [Edge(rand.randrange(n), rand.randrange(n), rand.randint(1, 100)) for _ in range(10*n)]
+
+    start = perf_counter()
+    d = floyd_warshall(distance_matrix(n, edges))
+    print(f"{n=}: floyd_warshall {perf_counter() - start:.3f}s")
+
+    start = perf_counter()
+    d_blocked = floyd_warshall_blocked(distance_matrix(n, edges))
+    print(f"{n=}: floyd_warshall_blocked {perf_counter() - start:.3f}s")
+
+    assert (d == d_blocked).all()
@@ -0,0 +1,73 @@
+# type: ignore
+
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import Edge, INF
+from shortest_path5 import shortest_paths_from
+from shortest_path_spfa import potentials
+
+
+def reweighted(edges, h):
+    # cost + h[i] - h[j] is never negative, and every i -> j path shifts by exactly h[i] - h[j]
+    return [Edge(edge.i, edge.j, edge.cost + h[edge.i] - h[edge.j]) for edge in edges]
+
+
+# the reweighted graph of each worker, set up by _load
+_graph = None
+
+
+def _load(n, edges):
+    global _graph
+    _graph = n, edges
+
+
+def _rows(sources):
+    n, edges = _graph
+    return [shortest_paths_from(n, edges, x) for x in sources]
+
+
+def shortest_paths(n, edges, *, workers=1):
+    # Johnson's algorithm: one Bellman-Ford (SPFA) for the potentials, then n Dijkstras on the
+    # reweighted graph, optionally spread over a process pool. O(nm log n) with negative edges.
+    # raises NegativeCycle if there is one
+    h = potentials(n, edges)
+    edges = reweighted(edges, h)
+
+    if workers <= 1 or n == 0:
+        rows = [shortest_paths_from(n, edges, x) for x in range(n)]
+    else:
+        step = max(1, -(-n // (4*workers)))
+        with ProcessPoolExecutor(workers, initializer=_load, initargs=(n, edges)) as pool:
+            rows = [row for part in pool.map(_rows, [range(x, min(x + step, n)) for x in range(0, n, step)]) for row in part]
+
+    for x, row in enumerate(rows):
+        for y in range(n):
+            if row[y] < INF:
+                row[y] += h[y] - h[x]
+
+    return rows
+
+
+if __name__ == '__main__':
+    for row in shortest_paths(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, -1),
+        Edge(3, 4, 1),
+        Edge(3, 1, 1),
+    ]):
+        print(row)
+
+    print()
+
+    for row in shortest_paths(9, [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, -1),
+        Edge(7, 6, 7),
+    ], workers=2):
+        print(row)
@@ -0,0 +1,151 @@
+# type: ignore
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop
+from multiprocessing.shared_memory import SharedMemory
+
+from utils import make_csr_adjacency, Edge, INF
+
+# below this many nodes, starting the pool costs more than the whole computation
+PARALLEL_MIN_NODES = 256
+
+# how many sources a worker takes at a time
+SOURCES_PER_TASK = 16
+
+# the shared distance matrix is int64 like the weights, with this standing in for INF
+UNREACHED = (1 << 63) - 1
+
+
+def shortest_paths_into(offsets, targets, weights, x, dists, unreached=INF):
+    # Dijkstra's algorithm from x over a CSR graph, writing into the preallocated row dists.
+    # unreached is what a node that can't be reached gets (an int for an int64 row)
+    n = len(offsets) - 1
+    for i in range(n):
+        dists[i] = unreached
+    dists[x] = 0
+
+    pq = []
+
+    heappush(pq, (0, x))
+
+    while pq:
+        (cost, i) = heappop(pq)
+
+        if cost > dists[i]:
+            continue
+
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            if cost + weights[k] < dists[j]:
+                dists[j] = cost + weights[k]
+                heappush(pq, (dists[j], j))
+
+
+# per-worker views into the shared graph and distance matrix, set up by _attach
+_shared = None
+
+
+def _attach(graph_name, dist_name, n, e):
+    global _shared
+    graph_mem = SharedMemory(graph_name)
+    dist_mem = SharedMemory(dist_name)
+    # SharedMemory.size can be rounded up to a whole page, so every view is cut to its exact length
+    graph = graph_mem.buf[:8*(n + 1 + 2*e)].cast('q')
+    _shared = (
+        graph_mem,
+        dist_mem,
+        graph[:n + 1],
+        graph[n + 1:n + 1 + e],
+        graph[n + 1 + e:n + 1 + 2*e],
+        dist_mem.buf[:8*n*n].cast('q'),
+        n,
+    )
+
+
+def _solve(sources):
+    _, _, offsets, targets, weights, dists, n = _shared
+    for x in sources:
+        shortest_paths_into(offsets, targets, weights, x, dists[x*n:(x + 1)*n], UNREACHED)
+
+
+def shortest_paths(n, edges, *, workers=None, min_nodes=PARALLEL_MIN_NODES):
+    # all-pairs shortest paths: the CSR graph is built once and shared by every source.
+    # for n >= min_nodes, the graph and the n*n distance matrix are put in shared memory and the
+    # sources are spread over a process pool, each worker writing its rows in place.
+    # either way the rows are lists of ints, with INF for the nodes that can't be reached.
+    graph = make_csr_adjacency(n, edges, directed=True)
+    e = len(graph.targets)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or n < min_nodes or n == 0:
+        dists = [[INF]*n for _ in range(n)]
+        for x in range(n):
+            shortest_paths_into(graph.offsets, graph.targets, graph.weights, x, dists[x])
+        return dists
+
+    graph_mem = SharedMemory(create=True, size=8*(n + 1 + 2*e))
+    dist_mem = SharedMemory(create=True, size=8*n*n)
+    try:
+        # see _attach: the segments may be bigger than asked for
+        shared = graph_mem.buf[:8*(n + 1 + 2*e)].cast('q')
+        shared[:n + 1] = graph.offsets
+        shared[n + 1:n + 1 + e] = array('q', graph.targets)
+        shared[n + 1 + e:n + 1 + 2*e] = graph.weights
+        shared.release()
+
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(graph_mem.name, dist_mem.name, n, e)) as pool:
+            chunks = [range(x, min(x + SOURCES_PER_TASK, n)) for x in range(0, n, SOURCES_PER_TASK)]
+            for _ in pool.map(_solve, chunks):
+                pass
+
+        # the segment is unlinked on return, so the rows are copied out once, as ints
+        dists = dist_mem.buf[:8*n*n].cast('q')
+        rows = []
+        for x in range(n):
+            row = dists[x*n:(x + 1)*n].tolist()
+            if UNREACHED in row:
+                row = [INF if d == UNREACHED else d for d in row]
+            rows.append(row)
+        dists.release()
+        return rows
+    finally:
+        graph_mem.close()
+        graph_mem.unlink()
+        dist_mem.close()
+        dist_mem.unlink()
+
+
+if __name__ == '__main__':
+    for row in shortest_paths(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(3, 1, 1),
+    ]):
+        print(row)
+
+    print()
+
+    from time import perf_counter
+
+    from utils import CS33Random
+    from shortest_path5 import shortest_paths as shortest_paths5
+
+    rand = CS33Random(33)
+    n = 1000
+    edges = [Edge(rand.randrange(n), rand.randrange(n), rand.randint(1, 100)) for _ in range(4*n)]
+
+    start = perf_counter()
+    dists5 = shortest_paths5(n, edges)
+    print(f"shortest_path5: {perf_counter() - start:.3f}s")
+
+    start = perf_counter()
+    dists = shortest_paths(n, edges)
+    print(f"shortest_path_parallel, {os.cpu_count()} workers: {perf_counter() - start:.3f}s")
+
+    assert dists == dists5
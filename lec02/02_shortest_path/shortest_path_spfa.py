@@ -0,0 +1,129 @@
+# type: ignore
+
+from array import array
+from collections import deque
+
+from utils import make_csr_adjacency, Edge, INF
+from shortest_path_neg import NegativeCycle
+
+
+def _parent_cycle(edges, parent):
+    # a cycle in the graph of parent pointers (parent[j] is the id of the edge that last
+    # improved j), as a list of edges in path order, or None.
+    # once the parent graph has a cycle, that cycle is negative.
+    n = len(parent)
+    seen = array('i', [-1])*n
+    for s in range(n):
+        i = s
+        while i >= 0 and seen[i] < 0:
+            seen[i] = s
+            i = edges[parent[i]].i if parent[i] >= 0 else -1
+
+        if i >= 0 and seen[i] == s:
+            cycle = []
+            j = i
+            while True:
+                edge = edges[parent[j]]
+                cycle.append(edge)
+                j = edge.i
+                if j == i:
+                    break
+            return cycle[::-1]
+
+    return None
+
+
+def _spfa(graph, edges, sources):
+    # queue-based Bellman-Ford with the small-label-first heuristic: a node whose new distance
+    # beats the front of the queue jumps to the front. every n relaxations, the parent pointers
+    # are checked for a cycle, so a negative cycle is reported as soon as it shows up there.
+    n = len(graph)
+    offsets, targets, weights, edge_ids = graph.offsets, graph.targets, graph.weights, graph.edge_ids
+
+    dists = [INF]*n
+    parent = array('i', [-1])*n
+    in_queue = bytearray(n)
+    queue = deque()
+    for x in sources:
+        dists[x] = 0
+        in_queue[x] = True
+        queue.append(x)
+
+    relaxations = 0
+    while queue:
+        i = queue.popleft()
+        in_queue[i] = False
+        di = dists[i]
+
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            if di + weights[k] < dists[j]:
+                dists[j] = di + weights[k]
+                parent[j] = edge_ids[k]
+
+                relaxations += 1
+                if relaxations % n == 0 and (cycle := _parent_cycle(edges, parent)) is not None:
+                    raise NegativeCycle(cycle)
+
+                if not in_queue[j]:
+                    in_queue[j] = True
+                    if queue and dists[j] < dists[queue[0]]:
+                        queue.appendleft(j)
+                    else:
+                        queue.append(j)
+
+    return dists
+
+
+def shortest_paths_from(n, edges, x):
+    # raises NegativeCycle, with the cycle's edges as its argument, if one is reachable from x
+    return _spfa(make_csr_adjacency(n, edges, directed=True), edges, [x])
+
+
+def shortest_paths(n, edges):
+    graph = make_csr_adjacency(n, edges, directed=True)
+    return [_spfa(graph, edges, [x]) for x in range(n)]
+
+
+def potentials(n, edges):
+    # distances from a virtual source joined to every node by a zero-cost edge.
+    # raises NegativeCycle if the graph has one anywhere
+    return _spfa(make_csr_adjacency(n, edges, directed=True), edges, range(n))
+
+
+def find_negative_cycle(n, edges):
+    # the edges of some negative cycle, in path order, or None if there is none
+    try:
+        potentials(n, edges)
+    except NegativeCycle as exc:
+        return exc.args[0]
+    return None
+
+
+if __name__ == '__main__':
+    for row in shortest_paths(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(3, 1, 1),
+    ]):
+        print(row)
+
+    print()
+
+    print(shortest_paths_from(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, -1),
+        Edge(3, 4, 1),
+        Edge(3, 1, 1),
+    ], 0))
+
+    print(find_negative_cycle(5, [
+        Edge(0, 1, 1),
+        Edge(1, 2, 1),
+        Edge(2, 3, -1),
+        Edge(3, 4, 1),
+        Edge(3, 1, -2),
+    ]))
@@ -1,15 +1,21 @@
 # type: ignore
 
-from utils import Edge, CS33Random
+from utils import Edge, CS33Random, INF
 
 from shortest_path1 import shortest_paths as sp1
 from shortest_path2 import shortest_paths as sp2
 from shortest_path3 import shortest_paths as sp3
 from shortest_path4 import shortest_paths as sp4
 from shortest_path5 import shortest_paths as sp5
+from shortest_path6 import shortest_paths as sp6
+from shortest_path_parallel import shortest_paths as sp_parallel, PARALLEL_MIN_NODES
+from shortest_path_floyd_numpy import shortest_paths as sp_floyd_numpy
 from shortest_path_neg import shortest_paths as sp_neg
+from shortest_path_spfa import shortest_paths as sp_spfa
+from shortest_path_johnson import shortest_paths as sp_johnson
+from shortest_path_dial import shortest_paths as sp_dial
 
-sols = sp1, sp2, sp3, sp4, sp5, sp_neg
+sols = sp1, sp2, sp3, sp4, sp5, sp6, sp_parallel, sp_floyd_numpy, sp_neg, sp_spfa, sp_johnson, sp_dial
 
 
 def main():
@@ -49,6 +55,27 @@ def main():
         return n, shuffled(rand, edges)
 
 
+    # the empty graph, including through the process pool
+    assert all(sp(0, []) == [] for sp in sols)
+    assert sp_johnson(0, [], workers=2) == []
+    assert sp_parallel(0, [], workers=2, min_nodes=0) == []
+
+    # dial must refuse negative costs rather than treat them as a 0-1 graph
+    try:
+        sp_dial(2, [Edge(0, 1, -1), Edge(1, 0, 1)])
+    except ValueError:
+        pass
+    else:
+        assert False, "sp_dial accepted a negative cost"
+
+    # the shared-memory pool of sp_parallel only runs on larger graphs: one above its threshold,
+    # and a few small ones with the threshold lowered. the rows must match exactly, ints and INF
+    for n, e, min_nodes in (PARALLEL_MIN_NODES, 3*PARALLEL_MIN_NODES, PARALLEL_MIN_NODES), (7, 12, 0), (20, 15, 0):
+        edges = [Edge(rand.randrange(n), rand.randrange(n), rand_cost()) for _ in range(e)]
+        answer = sp_parallel(n, edges, workers=2, min_nodes=min_nodes)
+        assert answer == sp5(n, edges)
+        assert all(type(d) is int or d == INF for row in answer for d in row)
+
     # ten million tests
     T = 10**7
     for cas in range(T):
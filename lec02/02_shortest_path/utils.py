@@ -1,8 +1,10 @@
 # type: ignore
 
-from collections.abc import Sequence
+from array import array
+from collections.abc import Sequence, Iterable
 
 from dataclasses import dataclass
+from itertools import count, repeat
 
 from random import Random
 
@@ -37,6 +39,69 @@ def make_adjacency_list(n: int, edges: Sequence[Edge], *, directed=False) -> lis
     return adj
 
 
+class CSRGraph:
+    # compressed sparse row adjacency. the half-edges out of node i sit at positions
+    # offsets[i]:offsets[i + 1] of three parallel arrays: targets (the other endpoint),
+    # weights (the cost) and edge_ids (the index into the original edge list).
+    # an undirected edge is stored twice, once from each endpoint. edges without a cost get 0.
+    #
+    # built either from a sequence of Edges, or from parallel arrays without an Edge per edge:
+    # edge k goes from sources[k] to targets[k] with cost costs[k] (all 0 if costs is None)
+    def __init__(self, n: int, edges: Sequence[Edge] | None=None, *, directed=False,
+                 sources: Sequence[int] | None=None, targets: Sequence[int] | None=None,
+                 costs: Sequence[int] | None=None):
+        self.n = n
+        self.directed = directed
+
+        if edges is not None:
+            assert sources is None and targets is None and costs is None
+            sources = [edge.i for edge in edges]
+            targets = [edge.j for edge in edges]
+            costs = [edge.cost or 0 for edge in edges]
+
+        # counting sort of the half-edges by source node
+        deg = array('q', [0])*(n + 1)
+        for i in sources:
+            deg[i + 1] += 1
+        if not directed:
+            for j in targets:
+                deg[j + 1] += 1
+
+        for i in range(n):
+            deg[i + 1] += deg[i]
+        self.offsets = deg
+
+        out = array('i', [0])*deg[n]
+        weights = array('q', [0])*deg[n]
+        edge_ids = array('i', [0])*deg[n]
+
+        fill = deg[:n]
+        for k, i, j, cost in zip(count(), sources, targets, repeat(0) if costs is None else costs):
+            out[fill[i]] = j
+            weights[fill[i]] = cost
+            edge_ids[fill[i]] = k
+            fill[i] += 1
+            if not directed:
+                out[fill[j]] = i
+                weights[fill[j]] = cost
+                edge_ids[fill[j]] = k
+                fill[j] += 1
+
+        self.targets = out
+        self.weights = weights
+        self.edge_ids = edge_ids
+
+    def __len__(self):
+        return self.n
+
+    def degree(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+
+def make_csr_adjacency(n: int, edges: Sequence[Edge], *, directed=False) -> CSRGraph:
+    return CSRGraph(n, edges, directed=directed)
+
+
 def make_adjacency_matrix(n: int, edges: Sequence[Edge], *, directed=False):
     mat = [[INF]*n for i in range(n)]
 
@@ -49,3 +114,81 @@ def make_adjacency_matrix(n: int, edges: Sequence[Edge], *, directed=False):
             add_edge(edge.j, edge.i, edge.cost, edge)
 
     return mat
+
+
+class IndexedMinHeap:
+    # binary min-heap over the items 0, 1, ..., n-1, each present at most once.
+    # pos[i] is where item i sits in the heap (-1 if absent), so decrease_key is O(log n)
+    # and the heap never holds more than n entries, unlike pushing duplicates into heapq.
+    # the same class is in lec01/sir_jem/utils.py (for prim3); change both together.
+    def __init__(self, n: int):
+        self.heap = array('i')
+        self.pos = array('i', [-1])*n
+        self.key = [INF]*n
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, i: int):
+        return self.pos[i] >= 0
+
+    def push(self, i: int, key):
+        # insert i, or lower its key if it is already in the heap.
+        # returns True if the key of i changed
+        if self.pos[i] >= 0:
+            return self.decrease_key(i, key)
+        self.key[i] = key
+        self.heap.append(i)
+        self._sift_up(len(self.heap) - 1)
+        return True
+
+    def decrease_key(self, i: int, key):
+        assert self.pos[i] >= 0
+        if key >= self.key[i]:
+            return False
+        self.key[i] = key
+        self._sift_up(self.pos[i])
+        return True
+
+    def pop(self):
+        # remove and return (key, i) with the smallest key
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.pos[top] = -1
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return self.key[top], top
+
+    def _sift_up(self, loc):
+        heap, pos, key = self.heap, self.pos, self.key
+        i = heap[loc]
+        k = key[i]
+        while loc > 0:
+            parent = (loc - 1) // 2
+            p = heap[parent]
+            if key[p] <= k:
+                break
+            heap[loc] = p
+            pos[p] = loc
+            loc = parent
+        heap[loc] = i
+        pos[i] = loc
+
+    def _sift_down(self, loc):
+        heap, pos, key = self.heap, self.pos, self.key
+        n = len(heap)
+        i = heap[loc]
+        k = key[i]
+        while (son := loc * 2 + 1) < n:
+            if son + 1 < n and key[heap[son + 1]] < key[heap[son]]:
+                son += 1
+            s = heap[son]
+            if k <= key[s]:
+                break
+            heap[loc] = s
+            pos[s] = loc
+            loc = son
+        heap[loc] = i
+        pos[i] = loc
@@ -0,0 +1,297 @@
+from utils import Edge
+from typing import Generic, Sequence, TypeVar
+from array import array
+from heapq import heappush, heappop
+from math import inf
+import pickle
+
+T = TypeVar("T")
+
+# how many nodes a witness search may settle before giving up and keeping the shortcut
+WITNESS_SETTLE_LIMIT = 64
+
+class ContractionHierarchy(Generic[T]):
+    """ Contraction hierarchy over a graph with non-negative weights.
+
+    Nodes are contracted one at a time in order of edge difference (shortcuts added minus
+    edges removed). Contracting v adds a shortcut u -> w for every u -> v -> w that has no
+    equally short witness path around v. Afterwards every edge points either up (to a node
+    contracted later) or down, and a shortest path always goes up, then down. So a query is
+    two small Dijkstras that only climb: forward from s over up edges and backward from t
+    over reversed down edges.
+
+    The up and down graphs are CSR arrays, and save/load write them to disk so the
+    preprocessing is paid only once.
+    """
+
+    def __init__(self, nodes: Sequence[T], edges: Sequence[Edge[T]], directed: bool = False):
+        self.nodes = list(nodes)
+        index = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+
+        # remaining graph, keeping only the cheapest of parallel edges
+        out_adj: list[dict[int, int]] = [{} for _ in range(n)]
+        in_adj: list[dict[int, int]] = [{} for _ in range(n)]
+
+        def add_arc(i: int, j: int, c: int) -> None:
+            if i != j and c < out_adj[i].get(j, inf):
+                out_adj[i][j] = c
+                in_adj[j][i] = c
+
+        for edge in edges:
+            assert edge.weight >= 0
+            add_arc(index[edge.x], index[edge.y], edge.weight)
+            if not directed:
+                add_arc(index[edge.y], index[edge.x], edge.weight)
+
+        # middle[(u, w)] = v for every shortcut u -> w added while contracting v
+        self.middle: dict[tuple[int, int], int] = {}
+
+        def witness(u: int, v: int, limit: float, targets: set[int]) -> dict[int, float]:
+            """ Distances from u to targets avoiding v, up to limit and a settle budget """
+            d = {u: 0}
+            pq = [(0, u)]
+            settled = 0
+            found: dict[int, float] = {}
+            while pq and settled < WITNESS_SETTLE_LIMIT:
+                cost, i = heappop(pq)
+                if cost > d[i] or cost > limit:
+                    continue
+                settled += 1
+                if i in targets:
+                    found[i] = cost
+                    if len(found) == len(targets):
+                        break
+                for j, c in out_adj[i].items():
+                    if j != v and cost + c < d.get(j, inf):
+                        d[j] = cost + c
+                        heappush(pq, (d[j], j))
+            return found
+
+        def shortcuts(v: int) -> list[tuple[int, int, int]]:
+            res = []
+            outs = out_adj[v]
+            for u, cu in in_adj[v].items():
+                targets = {w for w in outs if w != u}
+                if not targets:
+                    continue
+                limit = cu + max(outs[w] for w in targets)
+                found = witness(u, v, limit, targets)
+                for w in targets:
+                    if found.get(w, inf) > cu + outs[w]:
+                        res.append((u, w, cu + outs[w]))
+            return res
+
+        contracted_neighbors = [0] * n
+
+        def priority(v: int) -> int:
+            return len(shortcuts(v)) - len(in_adj[v]) - len(out_adj[v]) + contracted_neighbors[v]
+
+        pq = [(priority(v), v) for v in range(n)]
+        pq.sort()
+
+        self.rank = array('i', [0]) * n
+        up: list[list[tuple[int, int]]] = [[] for _ in range(n)]
+        down: list[list[tuple[int, int]]] = [[] for _ in range(n)]
+        contracted = [False] * n
+
+        for r in range(n):
+            # lazy updates: re-evaluate the top, and put it back if it is no longer the best
+            while True:
+                _, v = heappop(pq)
+                p = priority(v)
+                if not pq or p <= pq[0][0]:
+                    break
+                heappush(pq, (p, v))
+
+            self.rank[v] = r
+            contracted[v] = True
+
+            for w, c in out_adj[v].items():
+                up[v].append((w, c))
+            for u, c in in_adj[v].items():
+                down[v].append((u, c))
+
+            for u, w, c in shortcuts(v):
+                if c < out_adj[u].get(w, inf):
+                    add_arc(u, w, c)
+                    self.middle[(u, w)] = v
+
+            for w in out_adj[v]:
+                del in_adj[w][v]
+                contracted_neighbors[w] += 1
+            for u in in_adj[v]:
+                del out_adj[u][v]
+                contracted_neighbors[u] += 1
+            out_adj[v].clear()
+            in_adj[v].clear()
+
+        self.up = self._csr(up)
+        self.down = self._csr(down)
+        self._init_search_state()
+
+    @staticmethod
+    def _csr(adj: list[list[tuple[int, int]]]) -> tuple[array, array, array]:
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('q')
+        for arcs in adj:
+            for j, c in arcs:
+                targets.append(j)
+                weights.append(c)
+            offsets.append(len(targets))
+        return offsets, targets, weights
+
+    def _init_search_state(self) -> None:
+        n = len(self.nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.dist = ([inf] * n, [inf] * n)
+        self.parent = (array('i', [-1]) * n, array('i', [-1]) * n)
+        self.seen = (array('i', [0]) * n, array('i', [0]) * n)
+        self.stamp = 0
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            pickle.dump((self.nodes, self.rank, self.up, self.down, self.middle), f)
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy[T]":
+        ch = cls.__new__(cls)
+        with open(path, "rb") as f:
+            ch.nodes, ch.rank, ch.up, ch.down, ch.middle = pickle.load(f)
+        ch._init_search_state()
+        return ch
+
+    def _query(self, s: int, t: int) -> tuple[float, int]:
+        """ Returns the s -> t distance and the top node of the up-down path """
+        self.stamp += 1
+        stamp = self.stamp
+
+        pqs: tuple[list[tuple[int, int]], list[tuple[int, int]]] = ([], [])
+        for side, x in (0, s), (1, t):
+            self.dist[side][x] = 0
+            self.parent[side][x] = -1
+            self.seen[side][x] = stamp
+            heappush(pqs[side], (0, x))
+
+        best = inf
+        meet = -1
+        while pqs[0] or pqs[1]:
+            # a side stops once nothing left in it can beat the best meeting point
+            for side in 0, 1:
+                if pqs[side] and pqs[side][0][0] >= best:
+                    pqs[side].clear()
+            side = 0 if pqs[0] and (not pqs[1] or pqs[0][0][0] <= pqs[1][0][0]) else 1
+            if not pqs[side]:
+                break
+
+            offsets, targets, weights = self.up if side == 0 else self.down
+            dist, parent, seen = self.dist[side], self.parent[side], self.seen[side]
+
+            cost, i = heappop(pqs[side])
+            if cost > dist[i]:
+                continue
+
+            if self.seen[1 - side][i] == stamp and cost + self.dist[1 - side][i] < best:
+                best = cost + self.dist[1 - side][i]
+                meet = i
+
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                if seen[j] != stamp or cost + weights[k] < dist[j]:
+                    seen[j] = stamp
+                    dist[j] = cost + weights[k]
+                    parent[j] = i
+                    heappush(pqs[side], (dist[j], j))
+
+        return best, meet
+
+    def _unpack(self, u: int, w: int, out: list[int]) -> None:
+        """ Appends the original path u -> w without u, expanding shortcuts """
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            m = self.middle.get((a, b))
+            if m is None:
+                out.append(b)
+            else:
+                stack.append((m, b))
+                stack.append((a, m))
+
+    def distance(self, s: T, t: T) -> float:
+        return self._query(self.index[s], self.index[t])[0]
+
+    def path(self, s: T, t: T) -> list[T] | None:
+        best, meet = self._query(self.index[s], self.index[t])
+        if best == inf:
+            return None
+
+        hops: list[int] = []
+        v = meet
+        while v >= 0:
+            hops.append(v)
+            v = self.parent[0][v]
+        hops.reverse()
+        v = self.parent[1][meet]
+        while v >= 0:
+            hops.append(v)
+            v = self.parent[1][v]
+
+        path = [hops[0]]
+        for a, b in zip(hops, hops[1:]):
+            self._unpack(a, b, path)
+        return [self.nodes[v] for v in path]
+
+if __name__ == "__main__":
+    ch = ContractionHierarchy([0, 1, 2, 3, 4, 5, 6, 7], [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ])
+    print(ch.distance(0, 6), ch.path(0, 6))
+    print(ch.distance(7, 4), ch.path(7, 4))
+
+    # check against dijkstra on random graphs, then time queries on a weighted grid
+    import random
+    from time import perf_counter
+    from tempfile import TemporaryDirectory
+    from os import path as os_path
+    from dijkstra_reconstructed import sssp_dijkstra
+
+    rand = random.Random(33)
+    for _ in range(100):
+        n = rand.randint(1, 30)
+        rand_nodes = list(range(n))
+        rand_edges = [Edge(rand.randrange(n), rand.randrange(n), rand.randint(0, 20)) for _ in range(rand.randint(0, 3 * n))]
+        ch = ContractionHierarchy(rand_nodes, rand_edges)
+        for s in rand_nodes:
+            d, _ = sssp_dijkstra(rand_nodes, rand_edges, s)
+            assert all(ch.distance(s, t) == d[t] for t in rand_nodes)
+
+    side = 60
+    grid_nodes = [(r, c) for r in range(side) for c in range(side)]
+    grid_edges = [Edge((r, c), (r, c + 1), rand.randint(1, 9)) for r in range(side) for c in range(side - 1)]
+    grid_edges += [Edge((r, c), (r + 1, c), rand.randint(1, 9)) for r in range(side - 1) for c in range(side)]
+    queries = [(rand.choice(grid_nodes), rand.choice(grid_nodes)) for _ in range(200)]
+
+    start = perf_counter()
+    expected = [sssp_dijkstra(grid_nodes, grid_edges, s)[0][t] for s, t in queries]
+    print(f"full dijkstra per query: {perf_counter() - start:.3f}s")
+
+    start = perf_counter()
+    ch = ContractionHierarchy(grid_nodes, grid_edges)
+    print(f"contraction: {perf_counter() - start:.3f}s")
+
+    with TemporaryDirectory() as tmpdir:
+        ch.save(os_path.join(tmpdir, "grid.ch"))
+        ch = ContractionHierarchy.load(os_path.join(tmpdir, "grid.ch"))
+
+    start = perf_counter()
+    answers = [ch.distance(s, t) for s, t in queries]
+    print(f"hierarchy queries: {perf_counter() - start:.3f}s")
+    assert answers == expected
@@ -0,0 +1,216 @@
+from utils import Edge
+from typing import Generic, Sequence, TypeVar
+from array import array
+from heapq import heappush, heappop
+from math import inf
+
+T = TypeVar("T")
+
+class ShortestPathEngine(Generic[T]):
+    """ Answers many s -> t shortest path queries on one fixed graph with non-negative weights.
+
+    The graph is turned into forward and backward CSR arrays once. Each query is a bidirectional
+    Dijkstra, optionally guided by ALT (A*, landmarks and triangle inequality) potentials.
+    The per-node search state is allocated once and reused: a value only counts if its stamp
+    matches the current query, so nothing is cleared between queries.
+    """
+
+    def __init__(self, nodes: Sequence[T], edges: Sequence[Edge[T]], directed: bool = False, landmarks: int = 0):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+
+        arcs = [(self.index[edge.x], self.index[edge.y], edge.weight) for edge in edges]
+        if not directed:
+            arcs += [(j, i, c) for i, j, c in arcs]
+        assert all(c >= 0 for _, _, c in arcs)
+
+        self.fwd = self._csr(n, arcs)
+        self.bwd = self._csr(n, [(j, i, c) for i, j, c in arcs])
+
+        # search state, indexed [0] forward and [1] backward
+        self.dist = ([inf] * n, [inf] * n)
+        self.parent = (array('i', [-1]) * n, array('i', [-1]) * n)
+        self.seen = (array('i', [0]) * n, array('i', [0]) * n)
+        self.done = (array('i', [0]) * n, array('i', [0]) * n)
+        self.stamp = 0
+
+        # unreachable landmark distances are replaced by a value larger than any real distance,
+        # which keeps the landmark bounds valid (and feasible) without infinities
+        self.big = sum(c for _, _, c in arcs) + 1
+        self.landmark_from: list[list[int]] = []
+        self.landmark_to: list[list[int]] = []
+        for _ in range(min(landmarks, n)):
+            self._add_landmark()
+
+    @staticmethod
+    def _csr(n: int, arcs: list[tuple[int, int, int]]) -> tuple[array, array, array]:
+        offsets = array('q', [0]) * (n + 1)
+        for i, _, _ in arcs:
+            offsets[i + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        fill = offsets[:n]
+        targets = array('q', [0]) * len(arcs)
+        weights = array('q', [0]) * len(arcs)
+        for i, j, c in arcs:
+            targets[fill[i]] = j
+            weights[fill[i]] = c
+            fill[i] += 1
+
+        return offsets, targets, weights
+
+    def _full_dijkstra(self, graph: tuple[array, array, array], source: int) -> list[int]:
+        """ Plain single-source distances, with self.big for unreachable nodes """
+        offsets, targets, weights = graph
+        d = [self.big] * len(self.nodes)
+        d[source] = 0
+        pq = [(0, source)]
+        while pq:
+            cost, i = heappop(pq)
+            if cost > d[i]:
+                continue
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                if cost + weights[k] < d[j]:
+                    d[j] = cost + weights[k]
+                    heappush(pq, (d[j], j))
+        return d
+
+    def _add_landmark(self) -> None:
+        # farthest-first: the next landmark is the node farthest from all the current ones
+        if not self.landmark_from:
+            landmark = 0
+        else:
+            landmark = max(range(len(self.nodes)), key=lambda v: min(d[v] for d in self.landmark_from))
+        self.landmark_from.append(self._full_dijkstra(self.fwd, landmark))
+        self.landmark_to.append(self._full_dijkstra(self.bwd, landmark))
+
+    def _lower_bound(self, v: int, t: int) -> int:
+        """ A lower bound on d(v, t) from the triangle inequality through every landmark """
+        bound = 0
+        for d_from, d_to in zip(self.landmark_from, self.landmark_to):
+            bound = max(bound, d_from[t] - d_from[v], d_to[v] - d_to[t])
+        return bound
+
+    def _query(self, s: int, t: int) -> tuple[float, int]:
+        """ Returns the s -> t distance and the node where the two searches met """
+        self.stamp += 1
+        stamp = self.stamp
+
+        # average of the forward and backward potentials: the two searches then see the same
+        # non-negative reduced costs, and the usual top_f + top_b >= mu stopping rule holds
+        use_alt = bool(self.landmark_from)
+        potential: dict[int, float] = {}
+
+        def p(v: int) -> float:
+            if not use_alt:
+                return 0
+            if v not in potential:
+                potential[v] = (self._lower_bound(v, t) - self._lower_bound(s, v)) / 2
+            return potential[v]
+
+        pqs: tuple[list[tuple[float, int]], list[tuple[float, int]]] = ([], [])
+        for side, x in (0, s), (1, t):
+            self.dist[side][x] = 0
+            self.parent[side][x] = -1
+            self.seen[side][x] = stamp
+            heappush(pqs[side], (p(x) if side == 0 else -p(x), x))
+
+        best = inf
+        meet = -1
+        while pqs[0] and pqs[1]:
+            if pqs[0][0][0] + pqs[1][0][0] >= best:
+                break
+
+            side = 0 if len(pqs[0]) <= len(pqs[1]) else 1
+            sign = 1 if side == 0 else -1
+            offsets, targets, weights = self.fwd if side == 0 else self.bwd
+            dist, parent, seen, done = self.dist[side], self.parent[side], self.seen[side], self.done[side]
+            other_dist, other_seen = self.dist[1 - side], self.seen[1 - side]
+
+            _, i = heappop(pqs[side])
+            if done[i] == stamp:
+                continue
+            done[i] = stamp
+
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                cost = dist[i] + weights[k]
+                if seen[j] != stamp or cost < dist[j]:
+                    seen[j] = stamp
+                    dist[j] = cost
+                    parent[j] = i
+                    heappush(pqs[side], (cost + sign * p(j), j))
+
+                    if other_seen[j] == stamp and cost + other_dist[j] < best:
+                        best = cost + other_dist[j]
+                        meet = j
+
+            if other_seen[i] == stamp and dist[i] + other_dist[i] < best:
+                best = dist[i] + other_dist[i]
+                meet = i
+
+        return best, meet
+
+    def distance(self, s: T, t: T) -> float:
+        return self._query(self.index[s], self.index[t])[0]
+
+    def path(self, s: T, t: T) -> list[T] | None:
+        best, meet = self._query(self.index[s], self.index[t])
+        if best == inf:
+            return None
+
+        path: list[int] = []
+        v = meet
+        while v >= 0:
+            path.append(v)
+            v = self.parent[0][v]
+        path.reverse()
+
+        v = self.parent[1][meet]
+        while v >= 0:
+            path.append(v)
+            v = self.parent[1][v]
+
+        return [self.nodes[v] for v in path]
+
+if __name__ == "__main__":
+    engine = ShortestPathEngine([0, 1, 2, 3, 4, 5, 6, 7], [
+        Edge(0, 1, 2),
+        Edge(1, 2, 1),
+        Edge(2, 3, 1),
+        Edge(3, 4, 1),
+        Edge(4, 5, 1),
+        Edge(5, 6, 1),
+        Edge(0, 7, 1),
+        Edge(7, 6, 7),
+    ], landmarks=2)
+    print(engine.distance(0, 6), engine.path(0, 6))
+    print(engine.distance(7, 4), engine.path(7, 4))
+
+    # point queries on a weighted grid: engine vs a full single-source dijkstra per query
+    import random
+    from time import perf_counter
+    from dijkstra_reconstructed import sssp_dijkstra
+
+    rand = random.Random(33)
+    side = 60
+    grid_nodes = [(r, c) for r in range(side) for c in range(side)]
+    grid_edges = [Edge((r, c), (r, c + 1), rand.randint(1, 9)) for r in range(side) for c in range(side - 1)]
+    grid_edges += [Edge((r, c), (r + 1, c), rand.randint(1, 9)) for r in range(side - 1) for c in range(side)]
+    queries = [(rand.choice(grid_nodes), rand.choice(grid_nodes)) for _ in range(200)]
+
+    start = perf_counter()
+    expected = [sssp_dijkstra(grid_nodes, grid_edges, s)[0][t] for s, t in queries]
+    print(f"full dijkstra per query: {perf_counter() - start:.3f}s")
+
+    for landmarks in 0, 4, 8:
+        start = perf_counter()
+        engine = ShortestPathEngine(grid_nodes, grid_edges, landmarks=landmarks)
+        built = perf_counter()
+        answers = [engine.distance(s, t) for s, t in queries]
+        done = perf_counter()
+        assert answers == expected
+        print(f"engine, {landmarks} landmarks: build {built - start:.3f}s, queries {done - built:.3f}s")
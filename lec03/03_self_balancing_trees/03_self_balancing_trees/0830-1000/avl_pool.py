@@ -0,0 +1,151 @@
+# type: ignore
+from array import array
+
+from utils import NodePool
+
+NIL = NodePool.NIL
+
+
+class OrderedSet:
+    # avl.py's AVL tree, but with the nodes in a NodePool and a parallel height array.
+    # add/remove remember the path they walked down and rebalance back up along it
+    def __init__(self):
+        self.pool = NodePool()
+        self.height = array('b', [-1])  # NIL has height -1
+        self.root = NIL
+        super().__init__()
+
+
+    def _alloc(self, val):
+        x = self.pool.alloc(val)
+        if x == len(self.height):
+            self.height.append(0)
+        self.height[x] = 0
+        return x
+
+
+    def _link(self, parent, is_left, child):
+        # hang child under parent on the given side (parent NIL means the root)
+        if parent == NIL:
+            self.root = child
+        elif is_left:
+            self.pool.left[parent] = child
+        else:
+            self.pool.right[parent] = child
+
+
+    def _reset_height(self, x):
+        h = self.height
+        h[x] = max(h[self.pool.left[x]], h[self.pool.right[x]]) + 1
+
+
+    def _left_rotate(self, x):
+        left, right = self.pool.left, self.pool.right
+        y = right[x]
+        right[x], left[y] = left[y], x
+        self._reset_height(x)
+        self._reset_height(y)
+        return y
+
+
+    def _right_rotate(self, x):
+        left, right = self.pool.left, self.pool.right
+        y = left[x]
+        left[x], right[y] = right[y], x
+        self._reset_height(x)
+        self._reset_height(y)
+        return y
+
+
+    def _rebalance(self, x):
+        # returns the new root of x's subtree
+        left, right, h = self.pool.left, self.pool.right, self.height
+        self._reset_height(x)
+        if h[left[x]] >= h[right[x]] + 2:
+            if h[left[left[x]]] < h[right[left[x]]]:
+                left[x] = self._left_rotate(left[x])
+            x = self._right_rotate(x)
+        elif h[right[x]] >= h[left[x]] + 2:
+            if h[right[right[x]]] < h[left[right[x]]]:
+                right[x] = self._right_rotate(right[x])
+            x = self._left_rotate(x)
+        return x
+
+
+    def _rebalance_path(self, path):
+        # path[i] is the parent of path[i + 1]; fix them bottom-up
+        left = self.pool.left
+        for i in reversed(range(len(path))):
+            x = path[i]
+            parent = path[i - 1] if i else NIL
+            is_left = parent != NIL and left[parent] == x
+            old_height = self.height[x]
+            y = self._rebalance(x)
+            if y != x:
+                self._link(parent, is_left, y)
+            elif self.height[x] == old_height:
+                # nothing above can change
+                break
+
+
+    def add(self, val):
+        left, right, key = self.pool.left, self.pool.right, self.pool.key
+        path = []
+        t = self.root
+        while t:
+            if val == key[t]:
+                return
+            path.append(t)
+            t = left[t] if val < key[t] else right[t]
+
+        x = self._alloc(val)
+        self._link(path[-1] if path else NIL, bool(path) and val < key[path[-1]], x)
+        self._rebalance_path(path)
+
+
+    def remove(self, val):
+        left, right, key = self.pool.left, self.pool.right, self.pool.key
+        path = []
+        t = self.root
+        while t and key[t] != val:
+            path.append(t)
+            t = left[t] if val < key[t] else right[t]
+
+        if not t:
+            return
+
+        if left[t] and right[t]:
+            # take the successor's value and remove the successor instead
+            path.append(t)
+            s = right[t]
+            while left[s]:
+                path.append(s)
+                s = left[s]
+            key[t] = key[s]
+            t = s
+
+        parent = path[-1] if path else NIL
+        self._link(parent, parent != NIL and left[parent] == t, left[t] or right[t])
+        self.pool.dealloc(t)
+        self._rebalance_path(path)
+
+
+    def __contains__(self, val):
+        left, right, key = self.pool.left, self.pool.right, self.pool.key
+        t = self.root
+        while t:
+            if val < key[t]:
+                t = left[t]
+            elif val > key[t]:
+                t = right[t]
+            else:
+                return True
+        return False
+
+
+    def __len__(self):
+        return len(self.pool)
+
+
+    def __iter__(self):
+        return self.pool.inorder(self.root)
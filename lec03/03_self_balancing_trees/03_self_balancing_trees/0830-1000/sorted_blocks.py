@@ -0,0 +1,174 @@
+# type: ignore
+from bisect import bisect_left
+from itertools import chain
+
+# default block size: blocks are split once they reach twice this size
+LOAD = 512
+
+
+class OrderedSet:
+    # a sorted list of sorted blocks. a value is found by bisecting the block maxima, then the block,
+    # so the work is mostly C-level list ops on short, contiguous lists instead of chasing pointers.
+    # a Fenwick tree over the block sizes answers kth; it is rebuilt only when blocks split or vanish.
+    # load is the block size, per set; small values are only useful for testing the splits
+    def __init__(self, load=LOAD):
+        assert load >= 1
+        self.load = load
+        self.blocks = []
+        self.maxes = []
+        self.size = 0
+        self.fenwick = None
+        super().__init__()
+
+
+    def _locate(self, val):
+        # index of the block val belongs in
+        b = bisect_left(self.maxes, val)
+        return b - 1 if b == len(self.maxes) else b
+
+
+    def _fenwick_add(self, b, delta):
+        if self.fenwick is not None:
+            fenwick = self.fenwick
+            b += 1
+            while b < len(fenwick):
+                fenwick[b] += delta
+                b += b & -b
+
+
+    def _build_fenwick(self):
+        fenwick = [0] + [len(block) for block in self.blocks]
+        for i in range(1, len(fenwick)):
+            j = i + (i & -i)
+            if j < len(fenwick):
+                fenwick[j] += fenwick[i]
+        self.fenwick = fenwick
+
+
+    def add(self, val):
+        if not self.blocks:
+            self.blocks.append([val])
+            self.maxes.append(val)
+            self.size = 1
+            self.fenwick = None
+            return
+
+        b = self._locate(val)
+        block = self.blocks[b]
+        i = bisect_left(block, val)
+        if i < len(block) and block[i] == val:
+            return
+
+        block.insert(i, val)
+        self.maxes[b] = block[-1]
+        self.size += 1
+
+        load = self.load
+        if len(block) >= 2*load:
+            self.blocks[b:b + 1] = block[:load], block[load:]
+            self.maxes[b:b + 1] = block[load - 1], block[-1]
+            self.fenwick = None
+        else:
+            self._fenwick_add(b, 1)
+
+
+    def remove(self, val):
+        if not self.blocks:
+            return
+
+        b = self._locate(val)
+        block = self.blocks[b]
+        i = bisect_left(block, val)
+        if i == len(block) or block[i] != val:
+            return
+
+        del block[i]
+        self.size -= 1
+
+        if block:
+            self.maxes[b] = block[-1]
+            self._fenwick_add(b, -1)
+        else:
+            del self.blocks[b]
+            del self.maxes[b]
+            self.fenwick = None
+
+
+    def __contains__(self, val):
+        if not self.blocks:
+            return False
+        block = self.blocks[self._locate(val)]
+        i = bisect_left(block, val)
+        return i < len(block) and block[i] == val
+
+
+    def __len__(self):
+        return self.size
+
+
+    def __iter__(self):
+        return chain.from_iterable(self.blocks)
+
+
+    def kth(self, k):
+        # k-th smallest value, 0-indexed; negative k counts from the end like a list
+        if k < 0:
+            k += self.size
+        if not 0 <= k < self.size:
+            raise IndexError(k)
+
+        if self.fenwick is None:
+            self._build_fenwick()
+
+        # descend the Fenwick tree to the last block whose prefix size is <= k
+        fenwick = self.fenwick
+        b = 0
+        step = 1 << (len(fenwick) - 1).bit_length()
+        while step:
+            if b + step < len(fenwick) and fenwick[b + step] <= k:
+                b += step
+                k -= fenwick[b]
+            step >>= 1
+
+        return self.blocks[b][k]
+
+
+if __name__ == '__main__':
+    from random import Random
+    from time import perf_counter
+
+    from bst import OrderedSet as BSTSet
+    from treap import OrderedSet as TreapSet
+    from avl import OrderedSet as AVLSet
+    from treap_pool import OrderedSet as TreapPoolSet
+    from avl_pool import OrderedSet as AVLPoolSet
+
+    rand = Random(33)
+    n = 10**5
+    vals = rand.sample(range(10**12), n)
+
+    for name, Set in [
+        ('bst', BSTSet),
+        ('treap', TreapSet),
+        ('avl', AVLSet),
+        ('treap_pool', TreapPoolSet),
+        ('avl_pool', AVLPoolSet),
+        ('sorted_blocks', OrderedSet),
+    ]:
+        s = Set()
+
+        start = perf_counter()
+        for val in vals:
+            s.add(val)
+        time_add = perf_counter() - start
+
+        start = perf_counter()
+        assert all(val in s for val in vals)
+        time_contains = perf_counter() - start
+
+        start = perf_counter()
+        for val in vals:
+            s.remove(val)
+        time_remove = perf_counter() - start
+
+        print(f"{name:>13}: add {time_add:.3f}s, contains {time_contains:.3f}s, remove {time_remove:.3f}s")
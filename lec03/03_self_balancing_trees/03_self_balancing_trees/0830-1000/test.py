@@ -1,14 +1,23 @@
 # type: ignore
+from bisect import bisect_left, bisect_right
+
 from utils import Edge, CS33Random
 
 from list import OrderedSet as ListSet
 from bst import OrderedSet as BSTSet
-from treap import OrderedSet as TreapSet
+from treap import OrderedSet as TreapSet, SUM, MIN
 from avl import OrderedSet as AVLSet
+from treap_pool import OrderedSet as TreapPoolSet
+from avl_pool import OrderedSet as AVLPoolSet
+from sorted_blocks import OrderedSet as BlockSet
+
 
+def TinyBlockSet():
+    # tiny blocks, so that the random tests split and empty them
+    return BlockSet(load=4)
 
 
-set_classes = ListSet, BSTSet, TreapSet, AVLSet
+set_classes = ListSet, BSTSet, TreapSet, AVLSet, TreapPoolSet, AVLPoolSet, TinyBlockSet
 
 
 
@@ -34,6 +43,103 @@ def _simulate_set_ops(Set, ops):
                 assert 0 <= idx < len(sets)
                 yield val in sets[idx]
 
+def check_order_statistics(rand, ops):
+    # replay the ops on augmented treaps and check kth/rank/bisect/aggregates against sorted lists
+    for monoid in None, SUM, MIN:
+        sets = []
+        contents = []
+        for typ, *data in ops:
+            match typ:
+                case 'make':
+                    sets.append(TreapSet(monoid))
+                    contents.append(set())
+                case 'add':
+                    idx, val = data
+                    sets[idx].add(val)
+                    contents[idx].add(val)
+                case 'remove':
+                    idx, val = data
+                    sets[idx].remove(val)
+                    contents[idx].discard(val)
+
+        for s, vals in zip(sets, contents):
+            vals = sorted(vals)
+            assert len(s) == len(vals) and [*s] == vals
+            assert [s.kth(k) for k in range(len(vals))] == vals
+            probes = vals + [rand.getrandbits(128) for _ in range(3)]
+            for val in probes:
+                assert s.rank(val) == s.bisect_left(val) == bisect_left(vals, val)
+                assert s.bisect_right(val) == bisect_right(vals, val)
+            if monoid is None:
+                try:
+                    s.aggregate()
+                except ValueError:
+                    pass
+                else:
+                    assert False, "aggregate without a monoid"
+                continue
+            for _ in range(5):
+                lo, hi = sorted(rand.choices(probes, k=2))
+                inside = vals[bisect_left(vals, lo):bisect_left(vals, hi)]
+                expected = sum(inside) if monoid is SUM else min(inside, default=monoid.identity)
+                assert s.aggregate(lo, hi) == expected
+
+
+def check_non_numeric(ops):
+    # without a monoid the treap only compares values, so strings and tuples work like ints
+    for convert in str, lambda val: (val % 7, str(val)):
+        converted = [(typ, *data[:-1], convert(data[-1])) if data else (typ,) for typ, *data in ops]
+        assert simulate_set_ops(TreapSet, converted) == simulate_set_ops(ListSet, converted)
+
+
+def check_kth(rand, ops):
+    # sorted_blocks' ordered iteration and kth, against sorted lists
+    sets = []
+    contents = []
+    for typ, *data in ops:
+        match typ:
+            case 'make':
+                sets.append(TinyBlockSet())
+                contents.append(set())
+            case 'add':
+                idx, val = data
+                sets[idx].add(val)
+                contents[idx].add(val)
+            case 'remove':
+                idx, val = data
+                sets[idx].remove(val)
+                contents[idx].discard(val)
+            case 'contains':
+                # interleave kth queries with the updates
+                idx, _ = data
+                if contents[idx]:
+                    k = rand.randrange(len(contents[idx]))
+                    assert sets[idx].kth(k) == sorted(contents[idx])[k]
+
+    for s, vals in zip(sets, contents):
+        vals = sorted(vals)
+        assert len(s) == len(vals) and [*s] == vals
+        assert [s.kth(k) for k in range(len(vals))] == vals
+
+
+def check_set_algebra(rand):
+    # bulk-built treaps combined in place with absorb/absorb_intersection/absorb_difference,
+    # against python sets. the argument is consumed and must come out empty
+    bound = rand.choice([3, 11, 31, 111, 1111])
+    a = {rand.randrange(bound) for _ in range(rand.randint(0, bound))}
+    b = {rand.randrange(bound) for _ in range(rand.randint(0, bound))}
+
+    for op, expected in ('absorb', a | b), ('absorb_intersection', a & b), ('absorb_difference', a - b):
+        monoid = rand.choice([SUM, MIN])
+        s = TreapSet.from_sorted(sorted(a), monoid)
+        t = TreapSet.from_sorted(sorted(b), monoid)
+        getattr(s, op)(t)
+        expected = sorted(expected)
+        assert [*s] == expected and len(s) == len(expected) and len(t) == 0
+        assert [s.kth(k) for k in range(len(s))] == expected
+        assert s.aggregate() == (sum(expected) if monoid is SUM else min(expected, default=monoid.identity))
+
+
 def main():
     rand = CS33Random(33)
 
@@ -53,5 +159,10 @@ def main():
 
         assert all(answer == answers[0] for answer in answers)
 
+        check_order_statistics(rand, ops)
+        check_non_numeric(ops)
+        check_set_algebra(rand)
+        check_kth(rand, ops)
+
 if __name__ == '__main__':
     main()
@@ -1,17 +1,53 @@
 # type: ignore
 from dataclasses import dataclass
 
+from operator import add as _add
 from random import getrandbits
 
+INF = float('inf')
+
+
+@dataclass(frozen=True)
+class Monoid:
+    # an associative op with an identity. every node keeps the op folded over its subtree, in order
+    op: object
+    identity: object
+
+
+SUM = Monoid(_add, 0)
+MIN = Monoid(min, INF)
+MAX = Monoid(max, -INF)
+
+
 @dataclass
 class Node:
     val: int
     priority: int
     l: "Node | None" = None
     r: "Node | None" = None
+    size: int = 1
+    agg: object = None
+
+
+def size(node):
+    return 0 if node is None else node.size
+
 
+def agg(node, monoid):
+    return monoid.identity if node is None else node.agg
 
-def split(node, val):
+
+def pull(node, monoid=None):
+    # recompute the size of node from its children, and its aggregate if there is a monoid.
+    # without one the values only need to be comparable, and nothing else is done per node
+    l, r = node.l, node.r
+    node.size = (0 if l is None else l.size) + 1 + (0 if r is None else r.size)
+    if monoid is not None:
+        node.agg = monoid.op(monoid.op(agg(node.l, monoid), node.val), agg(node.r, monoid))
+    return node
+
+
+def split(node, val, monoid=None):
     # node points to a treap
     # returns three things.
     # - a treap consisting of all values < val
@@ -23,18 +59,18 @@ def split(node, val):
     if val == node.val:
         l, r = node.l, node.r
         node.l = node.r = None
-        return l, node, r
+        return l, pull(node, monoid), r
 
     if val < node.val:
-        l, mid, node.l = split(node.l, val)
-        return l, mid, node
+        l, mid, node.l = split(node.l, val, monoid)
+        return l, mid, pull(node, monoid)
     else:
         assert val > node.val
-        node.r, mid, r = split(node.r, val)
-        return node, mid, r
+        node.r, mid, r = split(node.r, val, monoid)
+        return pull(node, monoid), mid, r
 
 
-def merge(l, r):
+def merge(l, r, monoid=None):
     # l and r are treaps
     # every value in l is less than every value in r
     # return a single treap containing all of their nodes
@@ -45,55 +81,290 @@ def merge(l, r):
 
     if l.priority > r.priority:
         # l will be the root
-        l.r = merge(l.r, r)
-        return l
+        l.r = merge(l.r, r, monoid)
+        return pull(l, monoid)
     else:
-        r.l = merge(l, r.l)
-        return r
+        r.l = merge(l, r.l, monoid)
+        return pull(r, monoid)
 
 
-def add(node, val):
-    l, mid, r = split(node, val)
-    assert mid is None
-    mid = Node(val, priority=getrandbits(64))
-    return merge(merge(l, mid), r)
+def add(node, val, monoid=None, priority=None):
+    # val must not be in the treap. the new node goes down val's search path until it outranks
+    # a node, and takes that node's place with the rest of the subtree split around it, so only
+    # the nodes on the path are pulled
+    if priority is None:
+        priority = getrandbits(64)
+    if node is None or priority > node.priority:
+        mid = Node(val, priority)
+        mid.l, dup, mid.r = split(node, val, monoid)
+        assert dup is None
+        return pull(mid, monoid)
 
+    if val < node.val:
+        node.l = add(node.l, val, monoid, priority)
+    else:
+        assert val > node.val
+        node.r = add(node.r, val, monoid, priority)
+    return pull(node, monoid)
 
-def remove(node, val):
-    l, mid, r = split(node, val)
-    assert mid is not None
-    # free mid here
-    return merge(l, r)
+
+def remove(node, val, monoid=None):
+    # val must be in the treap. its node is replaced by the merge of its children
+    assert node is not None
+    if val == node.val:
+        # free node here
+        return merge(node.l, node.r, monoid)
+
+    if val < node.val:
+        node.l = remove(node.l, val, monoid)
+    else:
+        node.r = remove(node.r, val, monoid)
+    return pull(node, monoid)
+
+
+def build(vals, monoid=None):
+    # treap over strictly increasing vals in O(n): push each new node onto the stack of the
+    # rightmost path, popping lower-priority nodes into its left subtree (a Cartesian tree).
+    # a popped node's subtree is final, so that is when it gets pulled
+    stack = []
+    prev = None
+    for val in vals:
+        assert prev is None or prev < val
+        prev = val
+        node = Node(val, priority=getrandbits(64))
+        last = None
+        while stack and stack[-1].priority < node.priority:
+            last = pull(stack.pop(), monoid)
+        node.l = last
+        if stack:
+            stack[-1].r = node
+        stack.append(node)
+
+    root = None
+    while stack:
+        root = pull(stack.pop(), monoid)
+    return root
+
+
+def union(a, b, monoid=None):
+    # all the nodes of a and b; both treaps are consumed.
+    # the higher-priority root stays on top and the other treap is split around it
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority < b.priority:
+        a, b = b, a
+    l, _, r = split(b, a.val, monoid)
+    a.l = union(a.l, l, monoid)
+    a.r = union(a.r, r, monoid)
+    return pull(a, monoid)
+
+
+def intersection(a, b, monoid=None):
+    # the nodes of a whose values are also in b; both treaps are consumed
+    if a is None or b is None:
+        return None
+    if a.priority < b.priority:
+        a, b = b, a
+    l, mid, r = split(b, a.val, monoid)
+    a.l = intersection(a.l, l, monoid)
+    a.r = intersection(a.r, r, monoid)
+    if mid is None:
+        return merge(a.l, a.r, monoid)
+    return pull(a, monoid)
+
+
+def difference(a, b, monoid=None):
+    # the nodes of a whose values are not in b; both treaps are consumed
+    if a is None or b is None:
+        return a
+    l, mid, r = split(b, a.val, monoid)
+    a.l = difference(a.l, l, monoid)
+    a.r = difference(a.r, r, monoid)
+    if mid is not None:
+        return merge(a.l, a.r, monoid)
+    return pull(a, monoid)
 
 
 def contains(node, val):
+    while node is not None:
+        if val < node.val:
+            node = node.l
+        elif val > node.val:
+            node = node.r
+        else:
+            assert val == node.val
+            return True
+    return False
+
+
+def kth(node, k):
+    # the k-th smallest value, 0-indexed. assumes 0 <= k < size(node)
+    while True:
+        ls = size(node.l)
+        if k < ls:
+            node = node.l
+        elif k > ls:
+            k -= ls + 1
+            node = node.r
+        else:
+            return node.val
+
+
+def count_less(node, val, *, inclusive=False):
+    # number of values < val (or <= val if inclusive)
+    count = 0
+    while node is not None:
+        if node.val < val or inclusive and node.val == val:
+            count += size(node.l) + 1
+            node = node.r
+        else:
+            node = node.l
+    return count
+
+
+def fold(node, lo, hi, monoid):
+    # the monoid folded, in order, over the values in [lo, hi).
+    # walks down to the first node inside the range, then down each side of it,
+    # adding whole subtrees that are known to lie inside
+    while node is not None and not lo <= node.val < hi:
+        node = node.r if node.val < lo else node.l
     if node is None:
-        return False
+        return monoid.identity
 
-    if val < node.val:
-        return contains(node.l, val)
-    elif val > node.val:
-        return contains(node.r, val)
-    else:
-        assert val == node.val
-        return True
+    op = monoid.op
+
+    # values >= lo in the left subtree, built from the right end
+    left = monoid.identity
+    cur = node.l
+    while cur is not None:
+        if cur.val >= lo:
+            left = op(op(cur.val, agg(cur.r, monoid)), left)
+            cur = cur.l
+        else:
+            cur = cur.r
+
+    # values < hi in the right subtree, built from the left end
+    right = monoid.identity
+    cur = node.r
+    while cur is not None:
+        if cur.val < hi:
+            right = op(right, op(agg(cur.l, monoid), cur.val))
+            cur = cur.r
+        else:
+            cur = cur.l
+
+    return op(op(left, node.val), right)
+
+
+def inorder(node):
+    stack = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.l
+        node = stack.pop()
+        yield node.val
+        node = node.r
 
 
 class OrderedSet:
-    def __init__(self):
+    # the range aggregates are opt-in: pass a monoid (SUM, MIN, MAX, ...) to have every node keep one
+    def __init__(self, monoid=None):
         self.root: Node | None = None
+        self.monoid = monoid
         super().__init__()
 
 
     def add(self, val):
         if val not in self:
-            self.root = add(self.root, val)
+            self.root = add(self.root, val, self.monoid)
 
 
     def remove(self, val):
         if val in self:
-            self.root = remove(self.root, val)
+            self.root = remove(self.root, val, self.monoid)
+
+
+    @classmethod
+    def from_sorted(cls, vals, monoid=None):
+        # vals must be strictly increasing
+        s = cls(monoid)
+        s.root = build(vals, monoid)
+        return s
+
+
+    # the set algebra below is destructive on both sides, so it is named absorb rather than
+    # set.update and friends: the result is left in self, other's nodes are moved into self
+    # (or dropped), and other is left empty. reusing the nodes is what makes it O(m log(n/m + 1))
+    # instead of O(n + m); to keep other, pass OrderedSet.from_sorted([*other], monoid) instead
+    def absorb(self, other):
+        # self becomes self | other
+        assert other is not self and self.monoid == other.monoid
+        self.root, other.root = union(self.root, other.root, self.monoid), None
+
+
+    def absorb_intersection(self, other):
+        # self becomes self & other
+        assert other is not self and self.monoid == other.monoid
+        self.root, other.root = intersection(self.root, other.root, self.monoid), None
+
+
+    def absorb_difference(self, other):
+        # self becomes self - other
+        assert other is not self and self.monoid == other.monoid
+        self.root, other.root = difference(self.root, other.root, self.monoid), None
 
 
     def __contains__(self, val):
         return contains(self.root, val)
+
+
+    def __len__(self):
+        return size(self.root)
+
+
+    def __iter__(self):
+        return inorder(self.root)
+
+
+    def kth(self, k):
+        # k-th smallest value, 0-indexed; negative k counts from the end like a list
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        return kth(self.root, k)
+
+
+    def rank(self, val):
+        # number of values less than val
+        return count_less(self.root, val)
+
+
+    def bisect_left(self, val):
+        return count_less(self.root, val)
+
+
+    def bisect_right(self, val):
+        return count_less(self.root, val, inclusive=True)
+
+
+    def aggregate(self, lo=-INF, hi=INF):
+        # the set's monoid folded over the values in [lo, hi)
+        if self.monoid is None:
+            raise ValueError("aggregate needs a set built with a monoid, e.g. OrderedSet(SUM)")
+        return fold(self.root, lo, hi, self.monoid)
+
+
+    def range_sum(self, lo=-INF, hi=INF):
+        if self.monoid != SUM:
+            raise ValueError("range_sum needs a set built with OrderedSet(SUM)")
+        return self.aggregate(lo, hi)
+
+
+    def range_min(self, lo=-INF, hi=INF):
+        if self.monoid != MIN:
+            raise ValueError("range_min needs a set built with OrderedSet(MIN)")
+        return self.aggregate(lo, hi)
@@ -0,0 +1,121 @@
+# type: ignore
+from array import array
+
+from random import getrandbits
+
+from utils import NodePool
+
+NIL = NodePool.NIL
+
+
+class OrderedSet:
+    # treap.py's treap, but with the nodes in a NodePool and a parallel priority array,
+    # and with insert/remove done by walking down instead of recursive split/merge
+    def __init__(self):
+        self.pool = NodePool()
+        self.priority = array('Q', [0])
+        self.root = NIL
+        super().__init__()
+
+
+    def _alloc(self, val):
+        x = self.pool.alloc(val)
+        if x == len(self.priority):
+            self.priority.append(0)
+        self.priority[x] = getrandbits(64)
+        return x
+
+
+    def _link(self, parent, is_left, child):
+        # hang child under parent on the given side (parent NIL means the root)
+        if parent == NIL:
+            self.root = child
+        elif is_left:
+            self.pool.left[parent] = child
+        else:
+            self.pool.right[parent] = child
+
+
+    def _split(self, t, val):
+        # split the subtree t into values < val and values > val (val is not in t).
+        # slot 0's right and left fields serve as the heads of the two halves
+        left, right, key = self.pool.left, self.pool.right, self.pool.key
+        lo = hi = NIL
+        while t:
+            if key[t] < val:
+                right[lo] = t
+                lo = t
+                t = right[t]
+            else:
+                left[hi] = t
+                hi = t
+                t = left[t]
+        right[lo] = left[hi] = NIL
+        l, r = right[NIL], left[NIL]
+        right[NIL] = left[NIL] = NIL
+        return l, r
+
+
+    def _merge(self, parent, is_left, l, r):
+        # merge l and r (every value in l less than every value in r) and hang the result under parent
+        left, right, priority = self.pool.left, self.pool.right, self.priority
+        while l and r:
+            if priority[l] > priority[r]:
+                self._link(parent, is_left, l)
+                parent, is_left = l, False
+                l = right[l]
+            else:
+                self._link(parent, is_left, r)
+                parent, is_left = r, True
+                r = left[r]
+        self._link(parent, is_left, l or r)
+
+
+    def add(self, val):
+        if val in self:
+            return
+
+        left, right, key, priority = self.pool.left, self.pool.right, self.pool.key, self.priority
+        x = self._alloc(val)
+
+        # go down while the nodes outrank x; x takes the place of the first one that doesn't
+        parent, is_left, t = NIL, False, self.root
+        while t and priority[t] > priority[x]:
+            parent, is_left = t, val < key[t]
+            t = left[t] if is_left else right[t]
+
+        self._link(parent, is_left, x)
+        left[x], right[x] = self._split(t, val)
+
+
+    def remove(self, val):
+        left, right, key = self.pool.left, self.pool.right, self.pool.key
+        parent, is_left, t = NIL, False, self.root
+        while t and key[t] != val:
+            parent, is_left = t, val < key[t]
+            t = left[t] if is_left else right[t]
+
+        if t:
+            self._merge(parent, is_left, left[t], right[t])
+            self.pool.dealloc(t)
+
+
+    def __contains__(self, val):
+        left, right, key = self.pool.left, self.pool.right, self.pool.key
+        t = self.root
+        while t:
+            if val < key[t]:
+                t = left[t]
+            elif val > key[t]:
+                t = right[t]
+            else:
+                return True
+        return False
+
+
+    def __len__(self):
+        return len(self.pool)
+
+
+    def __iter__(self):
+        return self.pool.inorder(self.root)
@@ -1,4 +1,5 @@
 # type: ignore
+from array import array
 from collections.abc import Sequence
 
 from dataclasses import dataclass
@@ -46,6 +47,56 @@ class CS33Random(Random):
 
 
 
+class NodePool:
+    # tree nodes as slots in parallel arrays instead of one object each.
+    # slot 0 is NIL: it is never handed out, so 0 can stand for "no child".
+    # freed slots are chained through left[] and reused before the arrays grow
+    NIL = 0
+
+    def __init__(self):
+        self.left = array('i', [0])
+        self.right = array('i', [0])
+        self.key = [None]
+        self.free = 0
+        self.count = 0
+
+    def __len__(self):
+        # number of live nodes
+        return self.count
+
+    def alloc(self, key) -> int:
+        self.count += 1
+        if self.free:
+            i = self.free
+            self.free = self.left[i]
+            self.left[i] = self.right[i] = 0
+            self.key[i] = key
+        else:
+            i = len(self.key)
+            self.left.append(0)
+            self.right.append(0)
+            self.key.append(key)
+        return i
+
+    def dealloc(self, i: int):
+        self.count -= 1
+        self.key[i] = None
+        self.right[i] = 0
+        self.left[i] = self.free
+        self.free = i
+
+    def inorder(self, node: int):
+        left, right, key = self.left, self.right, self.key
+        stack = []
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            yield key[node]
+            node = right[node]
+
+
 def make_adjacency_list(n: int, edges: Sequence[Edge], *, directed=False) -> list[list[tuple[int, int, Edge]]]:
     adj = [[] for _ in range(n)]
 
@@ -1,59 +1,57 @@
 # type: ignore
-from utils import make_adjacency_list, Edge
+from array import array
+
+from utils import CSRGraph, Edge
+from dfs_engine import dfs
 
 
 def bridges_and_articulation_points(n, edges):
 
     # assert is_connected(n, edges)
 
-    adj = make_adjacency_list(n, edges)
+    adj = CSRGraph(n, edges)
 
-    vis = [-1]*n
-    low = [-1]*n
+    vis = array('i', [-1])*n
+    low = array('i', [-1])*n
+    parent_edge = array('i', [-1])*n
+    children = array('i', [0])*n
+    found_isolated_child = bytearray(n)
 
     time = 0
-    def visit(i):
+    def pre(i, parent, eid):
         nonlocal time
         assert vis[i] == -1
-        vis[i] = time
+        vis[i] = low[i] = time
         time += 1
+        parent_edge[i] = eid
+
+    def edge(i, j, eid):
+        # j was visited already
+        if eid != parent_edge[i]:
+            # back edge
+            low[i] = min(low[i], vis[j])
 
     bridges = []
     artic_points = []
-    def dfs(i, parent_edge):
-        visit(i)
-
-        is_root = parent_edge is None
-
-        low[i] = vis[i]
-
-        found_isolated_child = False
-        children = 0
-        for j, *_, edge in adj[i]:
-
-            if vis[j] == -1:
-                # tree edge
-                dfs(j, edge)
-                low[i] = min(low[i], low[j])
-
-                children += 1
+    def post(j, i, eid):
+        # j is done; fold it into its parent i
+        if i != -1:
+            low[i] = min(low[i], low[j])
 
-                if low[j] > vis[i]:
-                    # this is a bridge
-                    bridges.append(edge)
+            children[i] += 1
 
-                if low[j] >= vis[i]:
-                    found_isolated_child = True
+            if low[j] > vis[i]:
+                # this is a bridge
+                bridges.append(edges[eid])
 
-            elif edge is not parent_edge:
-                # back edge
-                low[i] = min(low[i], vis[j])
+            if low[j] >= vis[i]:
+                found_isolated_child[i] = True
 
-        if not is_root and found_isolated_child or is_root and children >= 2:
-            artic_points.append(i)
+        is_root = i == -1
+        if not is_root and found_isolated_child[j] or is_root and children[j] >= 2:
+            artic_points.append(j)
 
-    if n > 0:
-        dfs(0, None)
+    dfs(adj, range(n), pre=pre, edge=edge, post=post)
 
     return bridges, artic_points
 
@@ -0,0 +1,138 @@
+# type: ignore
+from array import array
+
+from utils import Edge
+from sccs_tarjan import condensation
+
+# targets per pass, a multiple of 64. each pass keeps one bitset of this many bits per SCC
+CHUNK_BITS = 64 << 10
+
+# what one chunk's bitsets may take, in ReachabilityOracle and reachable_batch alike;
+# the chunk is narrowed to fit
+CHUNK_MEMORY = 64 << 20
+
+
+def _fit_chunk_bits(k, memory):
+    # the widest multiple of 64, up to CHUNK_BITS, whose k rows of chunk_bits/8 bytes fit in memory.
+    # never narrower than one 64-bit block
+    return max(64, min(CHUNK_BITS, memory*8 // max(k, 1) >> 6 << 6))
+
+
+def _dag_adjacency(k, dag):
+    # the condensation edges are sorted by source, so offsets into them are enough
+    offsets = array('i', [0])*(k + 1)
+    for edge in dag:
+        offsets[edge.i + 1] += 1
+    for c in range(k):
+        offsets[c + 1] += offsets[c]
+    return offsets, array('i', (edge.j for edge in dag))
+
+
+def _chunk_rows(k, offsets, succ, lo, hi):
+    # rows[c] is a bitset of the SCCs in [lo, hi) that c reaches (bit d - lo for SCC d).
+    # SCCs are numbered topologically, so only c < hi can reach the chunk, and going from
+    # hi - 1 down to 0 every successor's row is done before it is needed
+    rows = [0]*hi
+    for c in reversed(range(hi)):
+        row = 1 << (c - lo) if c >= lo else 0
+        for d in succ[offsets[c]:offsets[c + 1]]:
+            if d < hi:
+                row |= rows[d]
+        rows[c] = row
+    return rows
+
+
+class ReachabilityOracle:
+    # answers "can u reach v" in O(1) after preprocessing, from a table of k x ceil(k/64) words
+    # (k = number of SCCs), so it is for graphs whose condensation fits k^2/8 bytes.
+    # the rows are built chunk by chunk as python int bitsets, then copied into the table.
+    # the chunks are sized like reachable_batch's, so building needs memory on top of the table
+    def __init__(self, n, edges, *, chunk_bits=None, memory=CHUNK_MEMORY):
+        k, self.comp, dag = condensation(n, edges)
+        offsets, succ = _dag_adjacency(k, dag)
+        if chunk_bits is None:
+            chunk_bits = _fit_chunk_bits(k, memory)
+        assert chunk_bits % 64 == 0
+
+        self.words = words = (k + 63) >> 6
+        self.table = array('Q', [0])*(k*words)
+        for lo in range(0, k, chunk_bits):
+            hi = min(k, lo + chunk_bits)
+            nbytes = (hi - lo + 7) >> 3
+            base = lo >> 6
+            for c, row in enumerate(_chunk_rows(k, offsets, succ, lo, hi)):
+                if row:
+                    chunk = array('Q')
+                    chunk.frombytes(row.to_bytes(nbytes + (-nbytes) % 8, 'little'))
+                    start = c*words + base
+                    self.table[start:start + len(chunk)] = chunk
+
+    def reaches(self, u, v):
+        cu, cv = self.comp[u], self.comp[v]
+        return self.table[cu*self.words + (cv >> 6)] >> (cv & 63) & 1 == 1
+
+
+def reachable_batch(n, edges, queries, *, chunk_bits=None, memory=CHUNK_MEMORY):
+    # offline: answers every (u, v) in queries, one chunk of target SCCs at a time.
+    # a chunk holds one python int of chunk_bits bits per SCC, about k*(chunk_bits/8 + 40) bytes
+    # with the int headers and list slots, so by default chunk_bits is picked to keep the bits
+    # within memory. at the floor of 64 targets per chunk that is still about 48 bytes per SCC,
+    # on top of the condensation itself
+    k, comp, dag = condensation(n, edges)
+    offsets, succ = _dag_adjacency(k, dag)
+    if chunk_bits is None:
+        chunk_bits = _fit_chunk_bits(k, memory)
+    assert chunk_bits % 64 == 0
+
+    # group the queries by the chunk of their target
+    by_chunk = [[] for _ in range(0, k, chunk_bits)]
+    for q, (u, v) in enumerate(queries):
+        by_chunk[comp[v] // chunk_bits].append(q)
+
+    answers = [False]*len(queries)
+    for lo, qs in zip(range(0, k, chunk_bits), by_chunk):
+        if qs:
+            rows = _chunk_rows(k, offsets, succ, lo, min(k, lo + chunk_bits))
+            for q in qs:
+                u, v = queries[q]
+                cu = comp[u]
+                answers[q] = cu < len(rows) and rows[cu] >> (comp[v] - lo) & 1 == 1
+    return answers
+
+
+if __name__ == '__main__':
+    import sys
+    from pathlib import Path
+    from random import Random
+    from time import perf_counter
+
+    sys.path.append(str(Path(__file__).resolve().parents[4] / 'lab01'))
+    from lab01c import bfs
+
+    rand = Random(33)
+    n, e, q = 20000, 40000, 2000
+    edges = [Edge(rand.randrange(n), rand.randrange(n)) for _ in range(e)]
+    queries = [(rand.randrange(n), rand.randrange(n)) for _ in range(q)]
+
+    adj_list = {}
+    for edge in edges:
+        adj_list.setdefault(edge.i, []).append(edge.j)
+
+    start = perf_counter()
+    expected = [bfs(u, v, adj_list) for u, v in queries]
+    time_bfs = perf_counter() - start
+
+    start = perf_counter()
+    oracle = ReachabilityOracle(n, edges)
+    time_build = perf_counter() - start
+    start = perf_counter()
+    answers = [oracle.reaches(u, v) for u, v in queries]
+    time_query = perf_counter() - start
+    assert answers == expected
+
+    start = perf_counter()
+    assert reachable_batch(n, edges, queries, chunk_bits=4096) == expected
+    time_batch = perf_counter() - start
+
+    print(f"{n=} {e=} {q=}: bfs {time_bfs:.3f}s, "
+          f"oracle build {time_build:.3f}s + queries {time_query:.3f}s, batch {time_batch:.3f}s")
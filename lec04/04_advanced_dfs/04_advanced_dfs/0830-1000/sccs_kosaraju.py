@@ -1,51 +1,38 @@
 # type: ignore
 from itertools import product
 
-from utils import Edge, make_adjacency_list
+from utils import Edge, CSRGraph
+from dfs_engine import dfs, postorder
 
 def sccs(n, edges):
-    adj = make_adjacency_list(n, edges, directed=True)
-
-    vis = [False]*n
-    def dfs(i, adj, stack):
-        assert not vis[i]
-        vis[i] = True
-        for j, *_ in adj[i]:
-            if not vis[j]:
-                dfs(j, adj, stack)
-
-        # finish na si i
-        stack.append(i)
-
-
-
+    adj = CSRGraph(n, edges, directed=True)
 
     # - for each node x:
     #     if x is not visited:
     #         DFS from x
-    stack = []
-    for x in range(n):
-        if not vis[x]:
-            dfs(x, adj, stack)
     # - ^ keep track of finishing times
+    stack = postorder(adj)
 
     # - reverse the graph
-    jda = make_adjacency_list(n, [
+    jda = CSRGraph(n, [
             Edge(edge.j, edge.i)
             for edge in edges
         ], directed=True)
 
-    vis = [False]*n
     # - for each node x in DECREASING finishing time:
     #     if x is not visited:
     #         DFS from x
     #         all nodes visited here constitute an SCC
-    while stack:
-        i = stack.pop()
-        if not vis[i]:
-            scc = []
-            dfs(i, jda, scc)
-            yield scc
+    # (one search over all the roots, so each search array is allocated once;
+    # a node reached as a root starts the next SCC)
+    sccs = []
+    def pre(i, parent, eid):
+        if parent == -1:
+            sccs.append([])
+        sccs[-1].append(i)
+
+    dfs(jda, reversed(stack), pre=pre)
+    yield from sccs
 
 
 if __name__ == '__main__':
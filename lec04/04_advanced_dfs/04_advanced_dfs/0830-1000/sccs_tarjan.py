@@ -0,0 +1,113 @@
+# type: ignore
+from array import array
+
+from utils import Edge, CSRGraph
+from dfs_engine import dfs
+
+
+def scc_ids(n, edges):
+    # returns (k, comp) where comp[i] is the SCC of node i, numbered 0..k-1 in topological order
+    # (every edge i -> j has comp[i] <= comp[j])
+    return tarjan(CSRGraph(n, edges, directed=True))
+
+
+def tarjan(adj: CSRGraph):
+    # Tarjan's algorithm over a directed CSRGraph: one DFS, no reversed graph. same output as scc_ids
+    n = len(adj)
+
+    index = array('i', [-1])*n
+    low = array('i', [0])*n
+    on_stack = bytearray(n)
+    stack = array('i', [0])*n
+    top = 0
+
+    # Tarjan finishes the SCCs sinks first, so they are numbered down from n - 1 and shifted at the end
+    comp = array('i', [-1])*n
+    found = 0
+
+    time = 0
+    def pre(i, parent, eid):
+        nonlocal time, top
+        index[i] = low[i] = time
+        time += 1
+        stack[top] = i
+        top += 1
+        on_stack[i] = True
+
+    def edge(i, j, eid):
+        # j is visited; it is in i's SCC-in-progress only if it is still on the stack
+        if on_stack[j] and index[j] < low[i]:
+            low[i] = index[j]
+
+    def post(i, parent, eid):
+        nonlocal top, found
+        if low[i] == index[i]:
+            # i is the root of an SCC: everything above it on the stack
+            c = n - 1 - found
+            found += 1
+            while True:
+                top -= 1
+                j = stack[top]
+                on_stack[j] = False
+                comp[j] = c
+                if j == i:
+                    break
+        if parent != -1 and low[i] < low[parent]:
+            low[parent] = low[i]
+
+    dfs(adj, range(n), pre=pre, edge=edge, post=post)
+
+    shift = n - found
+    for i in range(n):
+        comp[i] -= shift
+
+    return found, comp
+
+
+def condensation(n, edges):
+    # the DAG of SCCs. returns (k, comp, dag) where dag lists each edge between two different SCCs
+    # once, as Edge(comp[i], comp[j]), sorted by source; sources are in topological order
+    k, comp = scc_ids(n, edges)
+
+    # bucket the edges by the SCC of their source, then drop repeats with a last-seen stamp
+    out = [[] for _ in range(k)]
+    for edge in edges:
+        ci, cj = comp[edge.i], comp[edge.j]
+        if ci != cj:
+            out[ci].append(cj)
+
+    seen = array('i', [-1])*k
+    dag = []
+    for ci in range(k):
+        for cj in out[ci]:
+            if seen[cj] != ci:
+                seen[cj] = ci
+                dag.append(Edge(ci, cj))
+
+    return k, comp, dag
+
+
+def sccs(n, edges):
+    # same output as sccs_kosaraju.sccs: the SCCs as lists of nodes, in topological order
+    k, comp = scc_ids(n, edges)
+    groups = [[] for _ in range(k)]
+    for i in range(n):
+        groups[comp[i]].append(i)
+    yield from groups
+
+
+if __name__ == '__main__':
+    print(*sccs(4, [
+        Edge(0, 1),
+        Edge(1, 3),
+        Edge(3, 0),
+        Edge(3, 2),
+    ]))
+
+    print(condensation(4, [
+        Edge(0, 1),
+        Edge(1, 3),
+        Edge(3, 0),
+        Edge(3, 2),
+        Edge(1, 2),
+    ]))
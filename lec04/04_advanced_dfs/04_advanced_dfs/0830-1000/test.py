@@ -1,4 +1,6 @@
 # type: ignore
+from itertools import product
+
 from utils import Edge, CS33Random
 
 
@@ -6,6 +8,9 @@ from bridges_and_articulation_points_brute import bridges_and_articulation_point
 from bridges_and_articulation_points_dfs import bridges_and_articulation_points as cut_dfs
 from sccs_brute import sccs as sccs_brute
 from sccs_kosaraju import sccs as sccs_kosaraju
+from sccs_tarjan import sccs as sccs_tarjan, condensation
+from two_sat import TwoSat
+from reachability import ReachabilityOracle, reachable_batch
 
 cut_sols = (
     cut_brute,
@@ -15,6 +20,7 @@ cut_sols = (
 sccs_sols = (
     sccs_brute,
     sccs_kosaraju,
+    sccs_tarjan,
 )
 
 def normalize_cut(cut_nodes, cut_edges):
@@ -25,6 +31,17 @@ def normalize_sccs(sccs):
     return sorted(map(sorted, sccs))
 
 
+def check_condensation(n, edges, sccs):
+    # component ids are topologically ordered and the DAG has each inter-SCC edge exactly once
+    k, comp, dag = condensation(n, edges)
+    assert k == len(sccs)
+    assert normalize_sccs([[i for i in range(n) if comp[i] == c] for c in range(k)]) == normalize_sccs(sccs)
+    assert all(comp[edge.i] <= comp[edge.j] for edge in edges)
+    pairs = [(edge.i, edge.j) for edge in dag]
+    assert len(pairs) == len(set(pairs)) and pairs == sorted(pairs, key=lambda pair: pair[0])
+    assert set(pairs) == {(comp[edge.i], comp[edge.j]) for edge in edges if comp[edge.i] != comp[edge.j]}
+
+
 def main():
     rand = CS33Random(33)
 
@@ -75,9 +92,86 @@ def main():
 
             assert all(answer == answers[0] for answer in answers)
 
+            check_condensation(n, edges, answers[0])
+
+
+        def test_two_sat():
+            # random clauses and at-most-one groups, added in two rounds with a solve after each,
+            # against trying every assignment
+            n = rand.randint(1, rand.choice([3, 5, 8]))
+            sat = TwoSat(n)
+            constraints = []
+
+            def lit():
+                x = rand.randrange(n)
+                return x if rand.random() < 0.5 else ~x
+
+            def holds(assignment, a):
+                return assignment[a] if a >= 0 else not assignment[~a]
+
+            for _ in range(2):
+                for _ in range(rand.randint(0, 2*n)):
+                    if rand.random() < 0.8:
+                        a, b = lit(), lit()
+                        sat.add_clause(a, b)
+                        constraints.append(lambda v, a=a, b=b: holds(v, a) or holds(v, b))
+                    else:
+                        lits = [lit() for _ in range(rand.randint(1, 4))]
+                        sat.at_most_one(lits)
+                        constraints.append(lambda v, lits=lits: sum(holds(v, a) for a in lits) <= 1)
+
+                print(f"Trying case {cas} of {T}: 2-SAT {n=} constraints={len(constraints)}")
+
+                brute = any(
+                    all(check(v) for check in constraints)
+                    for v in product((False, True), repeat=n)
+                )
+                assignment = sat.solve()
+                assert (assignment is not None) == brute
+                if assignment is not None:
+                    assert all(check(assignment[:n]) for check in constraints)
+
+
+        def test_reachability():
+            # oracle and offline batch against a search from every node
+            n = rand.randint(1, rand.choice([3, 11, 31, 111, 311]))
+            e = rand.randint(0, rand.choice([3, 11, 31, 111, 311, 1111]))
+            edges = rand.random_graph(n, e)
+
+            print(f"Trying case {cas} of {T}: reachability {n=} {e=}")
+
+            adj = [[] for _ in range(n)]
+            for edge in edges:
+                adj[edge.i].append(edge.j)
+
+            def reach_from(s):
+                seen = {s}
+                stack = [s]
+                while stack:
+                    for j in adj[stack.pop()]:
+                        if j not in seen:
+                            seen.add(j)
+                            stack.append(j)
+                return seen
+
+            reach = [reach_from(s) for s in range(n)]
+            queries = [(u, v) for u in range(n) for v in range(n)]
+            expected = [v in reach[u] for u, v in queries]
+
+            oracle = ReachabilityOracle(n, edges, chunk_bits=64)
+            assert [oracle.reaches(u, v) for u, v in queries] == expected
+            assert reachable_batch(n, edges, queries, chunk_bits=64) == expected
+            # chunk size fitted to the memory budget: the 64-bit floor, and the default
+            assert reachable_batch(n, edges, queries, memory=1) == expected
+            assert reachable_batch(n, edges, queries) == expected
+            for oracle in ReachabilityOracle(n, edges, memory=1), ReachabilityOracle(n, edges):
+                assert [oracle.reaches(u, v) for u, v in queries] == expected
+
 
         test_cut()
         test_sccs()
+        test_two_sat()
+        test_reachability()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,99 @@
+# type: ignore
+from array import array
+
+from utils import CSRGraph
+from sccs_tarjan import tarjan
+
+
+class TwoSat:
+    # variables are 0, 1, ..., n-1. a literal is a variable x (x is true) or ~x (x is false).
+    #
+    # in the implication graph, literal x is node 2x and ~x is node 2x + 1, so negation is ^ 1.
+    # a clause (a or b) gives the edges ~a -> b and ~b -> a. the clauses are kept as two flat
+    # arrays of edge endpoints; each solve builds the CSR graph from them, so clauses can
+    # keep being added between solves.
+    def __init__(self, n=0):
+        self.n = n
+        self.sources = array('i')
+        self.targets = array('i')
+
+    def new_var(self) -> int:
+        self.n += 1
+        return self.n - 1
+
+    @staticmethod
+    def _node(lit: int) -> int:
+        return 2*lit if lit >= 0 else 2*~lit + 1
+
+    def add_clause(self, a: int, b: int):
+        # a or b
+        u, v = self._node(a), self._node(b)
+        assert max(u, v) < 2*self.n
+        self.sources.append(u ^ 1)
+        self.targets.append(v)
+        self.sources.append(v ^ 1)
+        self.targets.append(u)
+
+    def add_implication(self, a: int, b: int):
+        # a implies b
+        self.add_clause(~a, b)
+
+    def set(self, a: int):
+        # a must hold
+        self.add_clause(a, a)
+
+    def at_most_one(self, lits):
+        # prefix variables: p[k] says "one of lits[0..k] holds".
+        # lits[k] -> p[k], p[k-1] -> p[k], and p[k-1] -> ~lits[k]. 3 clauses and 1 variable per literal
+        prev = None
+        for lit in lits:
+            p = self.new_var()
+            self.add_implication(lit, p)
+            if prev is not None:
+                self.add_implication(prev, p)
+                self.add_implication(prev, ~lit)
+            prev = p
+
+    def solve(self):
+        # returns a satisfying assignment as a list of bools, or None if there is none.
+        # x is true iff x comes after ~x in the topological order of the SCCs
+        n = self.n
+        graph = CSRGraph(2*n, directed=True, sources=self.sources, targets=self.targets)
+        _, comp = tarjan(graph)
+
+        assignment = []
+        for x in range(n):
+            cx, cnx = comp[2*x], comp[2*x + 1]
+            if cx == cnx:
+                return None
+            assignment.append(cx > cnx)
+        return assignment
+
+
+if __name__ == '__main__':
+    from random import Random
+    from time import perf_counter
+
+    # a satisfiable instance with a million variables: every clause agrees with a hidden assignment
+    rand = Random(33)
+    n = 10**6
+    hidden = [rand.random() < 0.5 for _ in range(n)]
+
+    def lit(x, agree):
+        return x if hidden[x] == agree else ~x
+
+    sat = TwoSat(n)
+    start = perf_counter()
+    for _ in range(n):
+        sat.add_clause(lit(rand.randrange(n), True), lit(rand.randrange(n), rand.random() < 0.5))
+    print(f"adding {n} clauses: {perf_counter() - start:.3f}s")
+
+    start = perf_counter()
+    assignment = sat.solve()
+    print(f"solving {n} variables: {perf_counter() - start:.3f}s")
+    assert assignment is not None
+
+    # incremental: force a contradiction and solve again
+    sat.set(0)
+    sat.set(~0)
+    assert sat.solve() is None
@@ -1,46 +1,94 @@
 # type: ignore
 
-from utils import make_adjacency_list, Adj, Edge
+from array import array
+
+from utils import Adj, Edge, CSRGraph
+
+
+def hierholzer(graph: CSRGraph, s):
+    # iterative Hierholzer over the CSR arrays: walk unused edges from the top of the stack until
+    # stuck, then back up, emitting each edge as it is popped. cursor[i] is the next half-edge
+    # of i to try, so every half-edge is looked at once.
+    # returns the edge ids of a trail from s in order. it covers all the edges exactly when
+    # an eulerian path from s exists (and the edges are all reachable from s)
+    offsets, targets, edge_ids = graph.offsets, graph.targets, graph.edge_ids
+    cursor = array('q', offsets)
+
+    # each undirected edge (self-loops too) is stored twice; the second copy is skipped
+    used = None if graph.directed else bytearray(len(edge_ids) >> 1)
+
+    nodes = array('i', [s])
+    via = array('i', [-1])
+    path = array('i')
+    while nodes:
+        i = nodes[-1]
+        k, end = cursor[i], offsets[i + 1]
+        if used is not None:
+            while k < end and used[edge_ids[k]]:
+                k += 1
+        if k < end:
+            cursor[i] = k + 1
+            eid = edge_ids[k]
+            if used is not None:
+                used[eid] = True
+            nodes.append(targets[k])
+            via.append(eid)
+        else:
+            cursor[i] = k
+            nodes.pop()
+            eid = via.pop()
+            if eid >= 0:
+                path.append(eid)
+
+    path.reverse()
+    return path
+
+
+def eulerian_path(n, edges, *, directed=False):
+    # returns the edge ids of an eulerian path (or cycle) in order, or None if there is none.
+    # nodes without edges may sit in other components; the edges must all be in one
+    graph = CSRGraph(n, edges, directed=directed)
+    s = eulerian_start(graph)
+    if s is None:
+        return None
+    path = hierholzer(graph, s)
+    return path if len(path) == len(edges) else None
+
+
+def eulerian_start(graph: CSRGraph):
+    # where an eulerian path has to start, judging by degrees alone (None if it can't exist)
+    n = len(graph)
+    if graph.directed:
+        indeg = [0]*n
+        for j in graph.targets:
+            indeg[j] += 1
+        surplus = [graph.degree(i) - indeg[i] for i in range(n)]
+        starts = [i for i in range(n) if surplus[i] == 1]
+        if any(d not in (-1, 0, 1) for d in surplus) or len(starts) > 1:
+            return None
+    else:
+        starts = [i for i in range(n) if graph.degree(i) % 2]
+        if len(starts) > 2:
+            return None
+
+    if starts:
+        return starts[0]
+    # a cycle, if anything: start anywhere with an edge
+    return next((i for i in range(n) if graph.degree(i)), 0)
 
 
 def _find_eulerian_path(n, edges, s, t):
-    adj = make_adjacency_list(n, edges, directed=False)
-
-    used_edge = [False]*len(edges)  # this is only needed for the undirected case
-    rem_path = []
-
-    def consume_path(i, t):
-        # "consume" a path from i, and then expect to finish at t
-        path = []
-        while adj[i]:
-            a = adj[i].pop()
-            if not used_edge[a.idx]:
-                used_edge[a.idx] = True
-                path.append(a)
-                i = a.j
-
-        # append those edges to rem_path
-        while path:
-            rem_path.append(path.pop())
-
-        assert i == t
-
-    # take any path from s to t
-    consume_path(s, t)
-
-    # now, remaining CCs are connected components with all degrees even
-
+    path = hierholzer(CSRGraph(n, edges), s)
 
+    # walk the edge ids from s to turn them back into Adj steps
     eul_path = [Adj(s)]
-    while rem_path:
-        i = eul_path[-1].j
-
-        # consume an eulerian cycle on the component containing i
-        consume_path(i, i)
-
-        # then go to the next edge
-        eul_path.append(rem_path.pop())
+    i = s
+    for eid in path:
+        edge = edges[eid]
+        i = edge.j if edge.i == i else edge.i
+        eul_path.append(Adj(i, edge.cost, edge, eid))
 
+    assert i == t
     return eul_path
 
 
@@ -59,13 +107,34 @@ def find_eulerian_path(n, edges):
         return _find_eulerian_path(n, edges, *(odd_nodes[:2] or (0, 0)))
 
 
-print(find_eulerian_path(5, [
-    Edge(0, 1),
-    Edge(1, 2),
-    Edge(2, 3),
-    Edge(3, 4),
-    Edge(4, 0),
-    Edge(0, 3),
-    Edge(1, 4),
-    Edge(1, 3),
-]))
\ No newline at end of file
+if __name__ == '__main__':
+    from time import perf_counter
+
+    print(find_eulerian_path(5, [
+        Edge(0, 1),
+        Edge(1, 2),
+        Edge(2, 3),
+        Edge(3, 4),
+        Edge(4, 0),
+        Edge(0, 3),
+        Edge(1, 4),
+        Edge(1, 3),
+    ]))
+
+    # binary de Bruijn graph: node v -> (2v + b) mod 2^(d-1) for b in 0, 1. every node has
+    # in-degree = out-degree = 2, so there is an eulerian cycle through all 2^d edges
+    d = 20
+    n, m = 1 << (d - 1), 1 << d
+
+    start = perf_counter()
+    sources = array('i', (e >> 1 for e in range(m)))
+    targets = array('i', (e & (n - 1) for e in range(m)))
+    graph = CSRGraph(n, directed=True, sources=sources, targets=targets)
+    print(f"de Bruijn graph with {m} edges: built in {perf_counter() - start:.3f}s")
+
+    start = perf_counter()
+    path = hierholzer(graph, 0)
+    print(f"eulerian cycle: {perf_counter() - start:.3f}s")
+
+    assert len(path) == m
+    assert all((path[k] & (n - 1)) == path[k + 1] >> 1 for k in range(m - 1))
@@ -2,9 +2,9 @@
 
 from collections import Counter
 
-from utils import Edge, CS33Random
+from utils import Edge, CS33Random, is_connected
 
-from hierholzer import find_eulerian_path
+from hierholzer import find_eulerian_path, eulerian_path
 
 def main():
     rand = CS33Random(33)
@@ -46,6 +46,40 @@ def main():
 
             assert sorted(edges) == sorted(cedges)
 
+        # the edge-id engine, directed and undirected, on graphs that need not be connected
+        n = rand.randint(1, rand.choice([3, 11, 31]))
+        edges = rand.random_graph(n, rand.randint(0, rand.choice([3, 11, 31])))
+        for directed in False, True:
+            deg = Counter()
+            for edge in edges:
+                deg[edge.i] += 1
+                deg[edge.j] += -1 if directed else 1
+            if directed:
+                degrees_ok = all(d in (-1, 0, 1) for d in deg.values()) and sum(d == 1 for d in deg.values()) <= 1
+            else:
+                degrees_ok = sum(d % 2 for d in deg.values()) <= 2
+            touched = sorted({node for edge in edges for node in (edge.i, edge.j)})
+            expected = degrees_ok and is_connected(n, edges, nodes=touched)
+
+            path = eulerian_path(n, edges, directed=directed)
+            assert (path is not None) == expected
+            if path is not None:
+                assert sorted(path) == [*range(len(edges))]
+
+                def walks_from(i):
+                    # follow the edges in order from i
+                    for eid in path:
+                        edge = edges[eid]
+                        if edge.i == i:
+                            i = edge.j
+                        elif edge.j == i and not directed:
+                            i = edge.i
+                        else:
+                            return False
+                    return True
+
+                assert not path or any(walks_from(i) for i in (edges[path[0]].i, edges[path[0]].j))
+
 
 
 
@@ -1,7 +1,9 @@
 # type: ignore
 
-from collections.abc import Sequence
+from array import array
+from collections.abc import Sequence, Iterable
 from dataclasses import dataclass
+from itertools import count, repeat
 from random import Random
 
 
@@ -86,6 +88,68 @@ def make_adjacency_list(n: int, edges: Sequence[Edge], directed: bool = False) -
 
 
 
+class CSRGraph:
+    # compressed sparse row adjacency. the half-edges out of node i sit at positions
+    # offsets[i]:offsets[i + 1] of three parallel arrays: targets (the other endpoint),
+    # weights (the cost) and edge_ids (the index into the original edge list).
+    # an undirected edge is stored twice, once from each endpoint. edges without a cost get 0.
+    #
+    # built either from a sequence of Edges, or from parallel arrays without an Edge per edge:
+    # edge k goes from sources[k] to targets[k] with cost costs[k] (all 0 if costs is None)
+    def __init__(self, n: int, edges: Sequence[Edge] | None=None, *, directed=False,
+                 sources: Sequence[int] | None=None, targets: Sequence[int] | None=None,
+                 costs: Sequence[int] | None=None):
+        self.n = n
+        self.directed = directed
+
+        if edges is not None:
+            assert sources is None and targets is None and costs is None
+            sources = [edge.i for edge in edges]
+            targets = [edge.j for edge in edges]
+            costs = [edge.cost or 0 for edge in edges]
+
+        # counting sort of the half-edges by source node
+        deg = array('q', [0])*(n + 1)
+        for i in sources:
+            deg[i + 1] += 1
+        if not directed:
+            for j in targets:
+                deg[j + 1] += 1
+
+        for i in range(n):
+            deg[i + 1] += deg[i]
+        self.offsets = deg
+
+        out = array('i', [0])*deg[n]
+        weights = array('q', [0])*deg[n]
+        edge_ids = array('i', [0])*deg[n]
+
+        fill = deg[:n]
+        for k, i, j, cost in zip(count(), sources, targets, repeat(0) if costs is None else costs):
+            out[fill[i]] = j
+            weights[fill[i]] = cost
+            edge_ids[fill[i]] = k
+            fill[i] += 1
+            if not directed:
+                out[fill[j]] = i
+                weights[fill[j]] = cost
+                edge_ids[fill[j]] = k
+                fill[j] += 1
+
+        self.targets = out
+        self.weights = weights
+        self.edge_ids = edge_ids
+
+    def __len__(self):
+        return self.n
+
+    def degree(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+
+def make_csr_adjacency(n: int, edges: Sequence[Edge], *, directed=False) -> CSRGraph:
+    return CSRGraph(n, edges, directed=directed)
+
 
 def make_adjacency_matrix(n: int, edges: Sequence[Edge], *, directed: bool = False):
     mat = [[INF]*n for i in range(n)]
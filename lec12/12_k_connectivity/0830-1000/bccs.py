@@ -1,6 +1,9 @@
 # type: ignore
 
-from utils import make_adjacency_list, Edge
+from array import array
+
+from utils import CSRGraph, Edge
+from dfs_engine import dfs
 
 
 def bridges_articulation_points_and_bccs(n, edges):
@@ -10,71 +13,66 @@ def bridges_articulation_points_and_bccs(n, edges):
 
     # assert is_connected(n, edges)
 
-    adj = make_adjacency_list(n, edges)
-
-    vis = [-1]*n
-    low = [-1]*n
+    adj = CSRGraph(n, edges)
 
-    time = 0
-    def visit(i):
-        nonlocal time
-        assert vis[i] == -1
-        vis[i] = time
-        time += 1
+    vis = array('i', [-1])*n
+    low = array('i', [-1])*n
+    parent_edge = array('i', [-1])*n
+    children = array('i', [0])*n
+    found_isolated_child = bytearray(n)
 
     bridges = []
     artic_points = []
-    edge_visited = [False]*len(edges)
     edge_stack = []
     bccs = []
-    def extract_bcc(edge):
-        # pop until edge is popped
+    def extract_bcc(eid):
+        # pop until edge eid is popped
         while True:
-            last_edge = edge_stack.pop()
-            yield last_edge
-            if last_edge == edge:
+            last_eid = edge_stack.pop()
+            yield edges[last_eid]
+            if last_eid == eid:
                 return
 
-    def dfs(i, parent_edge):
-        visit(i)
-        is_root = parent_edge is None
-        low[i] = vis[i]
-        found_isolated_child = False
-        children = 0
-        for j, *_, edge_idx, edge in adj[i]:
-
-            if edge_visited[edge_idx]:
-                continue
-
-            edge_visited[edge_idx] = True
-
-            if vis[j] == -1:
-                # tree edge
-                edge_stack.append(edge)
-                dfs(j, edge)
-                low[i] = min(low[i], low[j])
-
-                children += 1
-
-                if low[j] > vis[i]:
-                    # this is a bridge
-                    bridges.append(edge)
-
-                if low[j] >= vis[i]:
-                    # found BCC!
-                    bccs.append(list(extract_bcc(edge)))
-                    found_isolated_child = True
-
-            elif edge is not parent_edge:
-                # back edge
-                edge_stack.append(edge)
-                low[i] = min(low[i], vis[j])
-
-        if not is_root and found_isolated_child or is_root and children >= 2:
-            artic_points.append(i)
-
-    if n > 0:
-        dfs(0, None)
+    time = 0
+    def pre(i, parent, eid):
+        nonlocal time
+        assert vis[i] == -1
+        vis[i] = low[i] = time
+        time += 1
+        parent_edge[i] = eid
+        if eid != -1:
+            # tree edge
+            edge_stack.append(eid)
+
+    def edge(i, j, eid):
+        # j was visited already. each non-tree edge is seen from both ends;
+        # it counts once, from the deeper end
+        if eid != parent_edge[i] and vis[j] < vis[i]:
+            # back edge
+            edge_stack.append(eid)
+            low[i] = min(low[i], vis[j])
+
+    def post(j, i, eid):
+        # j is done; fold it into its parent i
+        if i != -1:
+            low[i] = min(low[i], low[j])
+
+            children[i] += 1
+
+            if low[j] > vis[i]:
+                # this is a bridge
+                bridges.append(edges[eid])
+
+            if low[j] >= vis[i]:
+                # found BCC!
+                bccs.append(list(extract_bcc(eid)))
+                found_isolated_child[i] = True
+
+        is_root = i == -1
+        if not is_root and found_isolated_child[j] or is_root and children[j] >= 2:
+            artic_points.append(j)
+
+    dfs(adj, range(n), pre=pre, edge=edge, post=post)
 
     return bridges, artic_points, bccs
 
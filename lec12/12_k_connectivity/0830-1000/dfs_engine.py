@@ -0,0 +1,66 @@
+# type: ignore
+from array import array
+
+from utils import CSRGraph
+
+
+def dfs(graph: CSRGraph, roots, *, pre=None, edge=None, post=None, visited=None):
+    # depth-first search with an explicit stack, so deep graphs don't hit the recursion limit.
+    # cursor[i] is the position of the next half-edge out of i still to be looked at, which
+    # is all the state a recursive call would have kept in its for loop.
+    #
+    # callbacks (any of them may be None):
+    # - pre(i, parent, eid)   when i is first reached, through edge eid from parent (-1 for a root)
+    # - edge(i, j, eid)       for every half-edge i -> j whose target is already visited
+    # - post(i, parent, eid)  when all of i's half-edges are done
+    #
+    # visited can be passed in to continue an earlier search. it is returned
+    n = len(graph)
+    offsets, targets, edge_ids = graph.offsets, graph.targets, graph.edge_ids
+
+    if visited is None:
+        visited = bytearray(n)
+    cursor = array('q', offsets)
+    stack = array('i', [0])*n
+    parent_edge = array('i', [-1])*n
+
+    for root in roots:
+        if visited[root]:
+            continue
+
+        visited[root] = True
+        if pre:
+            pre(root, -1, -1)
+        stack[0] = root
+        top = 1
+
+        while top:
+            i = stack[top - 1]
+            k = cursor[i]
+            if k < offsets[i + 1]:
+                cursor[i] = k + 1
+                j = targets[k]
+                eid = edge_ids[k]
+                if not visited[j]:
+                    # tree edge: descend
+                    visited[j] = True
+                    parent_edge[j] = eid
+                    if pre:
+                        pre(j, i, eid)
+                    stack[top] = j
+                    top += 1
+                elif edge:
+                    edge(i, j, eid)
+            else:
+                top -= 1
+                if post:
+                    post(i, stack[top - 1] if top else -1, parent_edge[i])
+
+    return visited
+
+
+def postorder(graph: CSRGraph, roots=None):
+    # nodes in the order they finish
+    order = []
+    dfs(graph, range(len(graph)) if roots is None else roots, post=lambda i, p, eid: order.append(i))
+    return order